@@ -4,21 +4,58 @@
 
 import tkinter as tk
 from tkinter import ttk, filedialog
-from datetime import datetime, timedelta
-import pandas as pd
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import matplotlib.dates as mdates
+from datetime import datetime
+import importlib
+import sys
+import threading
+from concurrent.futures import CancelledError
+import time
+import numpy as np
 #import pmdarima as pm #do ARIMA szacujacego p,d,q
-from statsmodels.tsa.arima.model import ARIMA
 import os
-import matplotlib.pyplot as plt
-import time
-plt.style.use("ggplot")
+from coa import forecast   # lekki moduł - statsmodels importuje się dopiero w procesie roboczym
+from coa.cache import ForecastCache, default_cache_dir, forecast_key
+from coa.dataset_cache import DatasetCache
+from coa.fast_ar import predict_path_fast
+from coa.order_select import OrderStore, select_order_cached
+from coa.params_store import predict_path_warm
+from coa.store import SeriesStore
+from coa.timing import TIMINGS, span
+from coa.widgets import VirtualTable
+from coa.worker import FitWorker
+# matplotlib i pandas (coa.ingest) nie są importowane tutaj - ładują się w tle po pokazaniu okna (warm_imports)
+
+POLL_MS = 50  # co ile ms GUI sprawdza wyniki procesu roboczego
+WATCH_MS = 2000  # co ile ms sprawdzamy obserwowany folder z plikami CSV
+DEBUG = bool(os.environ.get("COA_DEBUG"))  # COA_DEBUG=1 -> czasy etapów każdej predykcji na stderr
+
+# Ciężkie moduły importowane w wątku w tle, zanim będą potrzebne (okno pojawia się od razu)
+DEFERRED_IMPORTS = (
+    "coa.ingest",                        # pandas
+    "matplotlib.figure",
+    "matplotlib.dates",
+    "matplotlib.style",
+    "matplotlib.backends.backend_tkagg",
+    "coa.plot",
+)
+# Moduły importowane z wyprzedzeniem w procesie roboczym (pierwsza predykcja nie czeka na statsmodels)
+WORKER_IMPORTS = ("pandas", "statsmodels.tsa.arima.model")
+
+
+def warm_imports():
+    for name in DEFERRED_IMPORTS:
+        importlib.import_module(name)
 
 # -------------------
 # Kod aplikacji
 # -------------------
+
+def format_dates(dates):
+    # datetime64 -> tekst w formacie plików CSV (dd.mm.yyyy [HH:MM]) do wyświetlenia w tabeli (tylko widoczne wiersze, bez pandas)
+    from coa.ingest import date_format
+    dates = np.asarray(dates, dtype="datetime64[s]")
+    fmt = date_format(dates)
+    return [d.item().strftime(fmt) for d in dates]
   
 class CryptoOracleApp:
     def __init__(self, root):    # Konstruktor klasy: self - atrybuty stałe; root - główne okno Tkinter
@@ -62,6 +99,7 @@ class CryptoOracleApp:
         # -------------------
         self._create_plot(content_frame)
         self.crypto_name = "Wykres danych"  # Początkowa nazwa nad wykresem (zostanie zaktualizowana nazwą kryptowaluty)
+        self.store = SeriesStore()          # Dane (daty, wartości, maska predykcji) - tabela jest tylko ich widokiem
 
         # -------------------
         # Przyciski i Entry
@@ -72,12 +110,77 @@ class CryptoOracleApp:
         load_btn = ttk.Button(button_frame, text="Wczytaj dane", command=self.load_data) # po nacinięciu uruchamia laod_data()
         load_btn.pack(side="left", padx=10)  #pozycjonowanie przycisku
         
-        predict_btn = ttk.Button(button_frame, text="Predykcja (t+1)", command=self.predict_next) # po nacinięciu uruchamia predict_next()
+        append_btn = ttk.Button(button_frame, text="Dopisz nowe wiersze", command=self.load_appended) # tylko wiersze dopisane do pliku
+        append_btn.pack(side="left", padx=10)
+
+        self.watch_btn = ttk.Button(button_frame, text="Obserwuj folder", command=self.toggle_watch) # nowe wiersze w plikach folderu
+        self.watch_btn.pack(side="left", padx=10)
+
+        predict_btn = ttk.Button(button_frame, text="Predykcja (t+h)", command=self.predict_next) # po nacinięciu uruchamia predict_next()
         predict_btn.pack(side="left", padx=10)  #pozycjonowanie przycisku
+
+        horizon_label = ttk.Label(button_frame, text="Horyzont (dni):")
+        horizon_label.pack(side="left", padx=5)
+        self.horizon_entry = ttk.Spinbox(button_frame, from_=1, to=forecast.MAX_HORIZON, width=4) # liczba kroków prognozy z jednego dopasowania
+        self.horizon_entry.set("1")
+        self.horizon_entry.pack(side="left", padx=5)
+
+        cancel_btn = ttk.Button(button_frame, text="Anuluj", command=self.cancel_prediction) # przerywa trwające dopasowanie modelu
+        cancel_btn.pack(side="left", padx=10)
+
+        model_frame = ttk.Frame(main_frame)  # drugi rząd: ustawienia modelu
+        model_frame.pack(pady=(0, 10))
+
+        self.refit_var = tk.BooleanVar(value=False)  # False -> kolejne predykcje tylko aktualizują model (bez ponownej estymacji)
+        refit_check = ttk.Checkbutton(model_frame, text="Dopasuj od nowa", variable=self.refit_var)
+        refit_check.pack(side="left", padx=5)
+
+        self.fast_var = tk.BooleanVar(value=False)  # True -> ARIMA(p,d,0) liczona jako AR(p) na różnicach (OLS), bez statsmodels
+        fast_check = ttk.Checkbutton(model_frame, text="Szybki AR (OLS)", variable=self.fast_var)
+        fast_check.pack(side="left", padx=5)
+
+        self.warm_var = tk.BooleanVar(value=False)  # True -> optymalizator startuje od zapisanych parametrów aktywa (coa.params_store)
+        warm_check = ttk.Checkbutton(model_frame, text="Start z zapisanych parametrów", variable=self.warm_var)
+        warm_check.pack(side="left", padx=5)
+
+        order_btn = ttk.Button(model_frame, text="Dobierz rząd", command=self.select_order) # przeszukiwanie (p,d,q) po AIC
+        order_btn.pack(side="left", padx=10)
+        self.order_label = ttk.Label(model_frame, text=f"ARIMA{forecast.ORDER}")  # rząd używany do predykcji
+        self.order_label.pack(side="left", padx=5)
+
+        fit_window_label = ttk.Label(model_frame, text="Okno dopasowania:")
+        fit_window_label.pack(side="left", padx=5)
+        self.fit_window_entry = ttk.Entry(model_frame, width=22)  # N ostatnich obserwacji albo dd.mm.yyyy-dd.mm.yyyy; puste = wszystko
+        self.fit_window_entry.pack(side="left", padx=5)
+
+        timings_btn = ttk.Button(model_frame, text="Czasy etapów", command=self.show_timings) # histogramy czasów predykcji
+        timings_btn.pack(side="left", padx=10)
         
-        self.predicted = 0  # licznik predykcji
-        self.last_ci = None  
-            # będzie trzymać (lower, upper) dla ostatniej predykcji
+        self.last_forecast = None
+            # będzie trzymać (prognozy, błędy standardowe) dla ostatniej ścieżki predykcji
+        self.worker = FitWorker(warmup=WORKER_IMPORTS)  # proces roboczy do dopasowywania ARIMA (poza wątkiem GUI)
+        self._queue_time = None
+        self._fitting = False
+        self.forecast_cache = ForecastCache(directory=os.path.join(default_cache_dir(), "forecasts"))
+            # prognozy w pamięci (LRU) i na dysku - ponowne wczytanie tych samych danych nie wymaga dopasowania
+        self._cache_key = None
+        self.datasets = DatasetCache(os.path.join(default_cache_dir(), "datasets"))
+            # binarne kopie wczytanych plików (.npy) - ponowne otwarcie pliku bez parsowania CSV
+        self.params_dir = os.path.join(default_cache_dir(), "params")  # zapisane parametry modeli (per aktywo i rząd)
+        self.ticker = None
+        self.tail = None  # coa.ingest.FileTail wczytanego pliku
+        self.watcher = None           # coa.watch.FolderWatcher, gdy obserwacja folderu jest włączona
+        self.tracker = None           # coa.watch.DatasetTracker - dane pozostałych plików z folderu
+        self._watch_id = 0
+        self._priming = None          # wątek, który wczytuje pliki folderu na starcie obserwacji
+        self._watch_changed = set()   # pliki zmienione w trakcie tego wczytywania (obsłużone po nim)
+        self._background = None       # pula (1 proces) na prognozy w tle dla zmienionych plików
+        self._background_jobs = {}    # ścieżka -> (future, klucz pamięci podręcznej)
+        self.orders_dir = os.path.join(default_cache_dir(), "orders")  # wybrane rzędy modeli (per aktywo)
+        self.order = forecast.ORDER
+        self._order_thread = None
+        self._order_pool = None       # pula procesów przeszukiwania rzędu (zamykana w on_close)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)  # zamknięcie okna kończy też proces roboczy
 
         window_label = ttk.Label(button_frame, text="Ile ostatnich punktów na wykresie:") # Dodanie napisu w polu przycisków
         window_label.pack(side="left", padx=5)  #pozycjonowanie tekstu
@@ -101,39 +204,36 @@ class CryptoOracleApp:
             text="⏱ Czas predykcji: —",
             font=("Arial", 10, "italic"))
         self.time_label.pack(anchor="w", padx=10, pady=4)
+
+        # -------------------
+        # Import w tle (matplotlib, pandas) i start procesu roboczego
+        # -------------------
+        self._imports = threading.Thread(target=warm_imports, daemon=True)
+        self._imports.start()
+        self.root.after(POLL_MS, self._finish_startup)  # wykres powstanie, gdy matplotlib będzie gotowy
+        self.root.after(0, self.worker.start)           # proces roboczy od razu importuje statsmodels
         
         
     # ===============================
     # Funkcja tworząca tabelę
     # ===============================
     def _create_table(self, parent):
-        table_frame = ttk.Frame(parent) # parent -> content_frame(); tworzymy tabele w naszym oknie content_frame()
-        table_frame.grid(row=0, column=0, sticky="nsew", padx=5) # frame grid rozciąga się w kierunkach nsew i znajduje sie w 1 kolumnie i 1 wierszu siatki aplikacji 
-
-        scroll_y = ttk.Scrollbar(table_frame, orient="vertical")
-        scroll_x = ttk.Scrollbar(table_frame, orient="horizontal")
-
-        self.table = ttk.Treeview(
-            table_frame,                # tabela wewnatrz table_frame
-            columns=("Time", "Value"),  # ID kolumna,  nie nazwy
-            show="headings",            # chowa kolumne #0
-            yscrollcommand=scroll_y.set,# podpięcie scrollbarów do tabeli
-            xscrollcommand=scroll_x.set)
-
-        self.table.heading("Time", text="Time")     # nazwanie kolumny z ID 'Time' jako 'Time'
-        self.table.heading("Value", text="Value")
-        self.table.column("Time", width=150)
-        self.table.column("Value", width=100)
-
-        scroll_y.config(command=self.table.yview)
-        scroll_x.config(command=self.table.xview)
-
-        self.table.grid(row=0, column=0, sticky="nsew")  # ustawnie elementów w siatce i okrelenie kierunków dostosowania przy resize
-        scroll_y.grid(row=0, column=1, sticky="ns")
-        scroll_x.grid(row=1, column=0, sticky="ew")
-
-        table_frame.rowconfigure(0, weight=1)    # pozwala tabeli rozciągać się pionowo przy zmianie rozmiaru okna
-        table_frame.columnconfigure(0, weight=1) # pozwala tabeli rozciągać się poziomo przy zmianie rozmiaru okna
+        # parent -> content_frame(); tworzymy tabele w naszym oknie content_frame()
+        # VirtualTable trzyma w Tk tylko widoczne wiersze i pobiera je z self.store przy przewijaniu
+        self.table = VirtualTable(
+            parent,
+            columns=("Time", "Value"),            # ID kolumn (i ich nagłówki)
+            row_count=lambda: len(self.store),    # liczba wierszy = długość szeregu
+            rows=self._table_rows,                # funkcja zwracająca widoczny fragment danych
+            widths=(150, 100))
+        self.table.grid(row=0, column=0, sticky="nsew", padx=5) # tabela rozciąga się w kierunkach nsew i znajduje sie w 1 kolumnie i 1 wierszu siatki aplikacji
+
+    def _table_rows(self, start, stop):
+        # wiersze [start, stop) do wyświetlenia w tabeli; predykcje zaokrąglamy do 6 miejsc
+        dates = format_dates(self.store.dates[start:stop])
+        values = self.store.values[start:stop].tolist()
+        is_pred = self.store.is_prediction[start:stop].tolist()
+        return [(d, round(v, 6) if p else v) for d, v, p in zip(dates, values, is_pred)]
 
     # ===============================
     # Funkcja tworząca wykres
@@ -142,24 +242,38 @@ class CryptoOracleApp:
         self.plot_frame = ttk.Frame(parent)
         self.plot_frame.grid(row=0, column=1, sticky="nsew", padx=5) # frame grid rozciąga się w kierunkach nsew i znajduje sie w 2 kolumnie i 1 wierszu siatki aplikacji
 
-        self.fig = Figure(figsize=(5, 4), dpi=100) # tworzy obiekt wykresu (rozmiar + jakość)
-        self.ax = self.fig.add_subplot(111) # dodaje jedną oś (1x1, pierwszy wykres)
-        self.ax.set_title("Wykres danych")
-        self.ax.set_xlabel("Time")
-        self.ax.set_ylabel("Value")
+        self.plot = None  # wykres tworzymy w _create_figure(), po zaimportowaniu matplotlib
 
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
-            # Łączy wykres matplotlib (self.fig) z Tkinterem i osadza go w ramce plot_frame
-        self.canvas.draw()
+    def _finish_startup(self):
+        if self._imports.is_alive():
+            self.root.after(POLL_MS, self._finish_startup)  # import jeszcze trwa - sprawdzimy ponownie
+            return
+        self._create_figure()
+        self.refresh_plot()  # jeśli dane wczytano przed utworzeniem wykresu
+
+    def _create_figure(self):
+        import matplotlib.style
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from coa.plot import PricePlot
+        matplotlib.style.use("ggplot")
+
+        fig = Figure(figsize=(5, 4), dpi=100) # tworzy obiekt wykresu (rozmiar + jakość)
+        canvas = FigureCanvasTkAgg(fig, master=self.plot_frame)
+            # Łączy wykres matplotlib (fig) z Tkinterem i osadza go w ramce plot_frame
+        self.plot = PricePlot(fig, canvas)
+            # Oś, linie i adnotacja tworzone raz - refresh_plot tylko podmienia ich dane
+        canvas.draw()
             # Rysuje wykres (pierwsze renderowanie figury)
-        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        canvas.get_tk_widget().pack(fill="both", expand=True, before=self.time_label)
             # Pobiera widget (obiekt z wykresem) Tkintera z canvasu i rozciąga go na całą dostępną przestrzeń
 
     # ===============================
     # Wczytywanie danych
     # ===============================
-    def load_data(self):
-        file_path = filedialog.askopenfilename(
+    def load_data(self, file_path=None):
+        # file_path=None - wybór pliku w oknie dialogowym
+        file_path = file_path or filedialog.askopenfilename(
             title="Wybierz plik CSV",    # tytuł okna wyboru pliku
             filetypes=(("CSV Files", "*.csv"), ("All Files", "*.*"))
         )
@@ -168,106 +282,358 @@ class CryptoOracleApp:
         
         self.crypto_name = os.path.splitext(os.path.basename(file_path))[0]  # bierze nazwę pliku bez rozszerzenia i zapisuje ją w self.crypto_name
 
-        df = pd.read_csv(file_path, sep=';')
-        time_col = df.columns[0]
-        value_col = df.columns[1]
-
-        # ---- aktualizacja tabeli ----
-        self.table.delete(*self.table.get_children()) # czysci tabele
-        for _, row in df.iterrows():  
-            # iterujemy po wszystkich wierszach DataFrame (index ignorujemy, bierzemy tylko row)
-            self.table.insert("", "end", values=(row[time_col], row[value_col]))  
-                # dodajemy nowy wiersz do tabeli Treeview
-                # "" -> brak rodzica (najwyższy poziom w drzewie danych; u nas wszystkie wiersze nie maja rodzicow)
-                # "end" -> wstaw na końcu tabeli
-                # values=() -> wartości kolumn w tym wierszu (czas i wartość)
-        self.table.update() # wymusza natychmiastowe odświeżenie widoku w GUI
+        # ---- zapis do magazynu danych (parsujemy raz, przy wczytaniu) ----
+        from coa.ingest import FileTail, read_series  # pandas - zwykle już zaimportowany w tle
+        dates, values, self.ticker = read_series(file_path, cache=self.datasets)  # daty datetime64 + wartości float64 (pierwsza kolumna z cenami)
+        self.store.load(dates, values)
+        self.tail = FileTail(file_path, dates)  # miejsce, do którego plik jest wczytany (dla "Dopisz nowe wiersze")
+        self._set_order(OrderStore(self.orders_dir).get(self.ticker) or forecast.ORDER)  # rząd dobrany wcześniej dla tego aktywa
+
+        # ---- aktualizacja tabeli (tylko widok danych z self.store) ----
+        self.table.refresh(top=0)  # wyświetla pierwsze wiersze; kolejne są pobierane z self.store przy przewijaniu
         
         # ---- reset zmiennych ----
-        self.predicted = 0
+        self.worker.cancel()  # predykcja dla poprzednich danych nie jest już potrzebna
         self.last_pred_time = None
-        self.last_ci = None
+        self.last_forecast = None
         self.time_label.config(text="⏱ Czas predykcji: —")
         
         # ---- odśwież wykres ----
         self.refresh_plot()
         
+    # ===============================
+    # Dopisanie nowych wierszy z końca pliku
+    # ===============================
+    def load_appended(self, forecast_new=None):
+        # parsuje tylko wiersze dopisane do pliku od ostatniego wczytania (pliki rosnące o jeden dzień)
+        # forecast_new - czy liczyć nową prognozę; None = tylko wtedy, gdy jakaś była już pokazana
+        if self.tail is None:
+            tk.messagebox.showwarning("Brak danych", "Najpierw wczytaj dane!")
+            return
+        start = time.perf_counter()
+        new = self.tail.read_new()
+        if new is None:
+            self.load_data(self.tail.path)  # plik zmienił się inaczej niż przez dopisanie - wczytujemy całość
+            return
+        dates, values = new[0], new[1][:, 0]  # pierwsza kolumna z cenami, jak w read_series
+        keep = ~np.isnan(values)
+        if not keep.any():
+            self.time_label.config(text="⏱ Brak nowych wierszy w pliku")
+            return
+
+        # ---- nowe obserwacje zamiast starych prognoz ----
+        had_forecast = self.last_forecast is not None if forecast_new is None else forecast_new
+        self.worker.cancel()  # prognoza dla starszych danych nie jest już potrzebna
+        self.store.drop_predictions()
+        self.store.extend(dates[keep], values[keep], is_prediction=False)
+        self.last_forecast = None
+        self.table.refresh()
+        self.time_label.config(
+            text=f"⏱ Dopisano wierszy: {int(keep.sum())} ({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+        # ---- model: nowe punkty dokłada filtr Kalmana (update_or_fit), prognoza liczona od nowa ----
+        if had_forecast:
+            self.predict_next()
+        else:
+            self.refresh_plot()
+
     # ===============================
     # Predykcja
     # ===============================
     
-    def predict(self):
-        start_time = time.perf_counter() # Rozpoczynamy mierzenie czasu predykcji
-        # pobieramy wszystkie wartości z kolumny "Value" tabeli i zamieniamy na float
-        values = []
+    def predict_next(self):
+        # sprawdzenie, czy są dane
+        if not len(self.store):
+            tk.messagebox.showwarning("Brak danych", "Najpierw wczytaj dane!")
+            return
+        if self.worker.busy:
+            return  # poprzednia predykcja jeszcze trwa (można ją anulować)
+
+        # ---- ten sam szereg, rząd i horyzont liczony wcześniej? wynik z pamięci podręcznej ----
+        TIMINGS.begin()  # czasy etapów tej predykcji (extract, fit, forecast, conf_int, render)
+        fast = self.fast_var.get() and self.order[2] == 0
+        with span("extract"):
+            values = self.store.values.copy()  # kopia - magazyn danych może się zmienić w trakcie dopasowania
+            steps = self._horizon()
+            window = self._fit_window()
+            if window is not False and not fast:
+                self._cache_key = forecast_key(values, self.order, steps, window=window)
+                cached = self.forecast_cache.get(self._cache_key)
+        if window is False:
+            return
+        if fast:
+            # postać zamknięta liczy się w ułamku milisekundy - bez procesu roboczego i pamięci podręcznej
+            start = time.perf_counter()
+            mean, se = predict_path_fast(values, steps, self.order, window=window)
+            self.last_pred_time = time.perf_counter() - start
+            self._add_prediction(mean, se)
+            self._show_stages(f"⏱ Szybki AR (OLS): {self.last_pred_time*1000:.2f} ms")
+            return
 
-        for item in self.table.get_children():
-            try:
-                values.append(float(str(self.table.item(item)["values"][1]).replace(",", ".")))
-            except ValueError: #obsluga błędu (jeżeli wystapi pustka komórka, spacja na końcu itp.)
-                pass
+        if cached is not None:
+            self._add_prediction(*cached)
+            self._show_stages("⏱ Wynik z pamięci podręcznej (bez dopasowania)")
+            return
 
-        # minimalna liczba obserwacji potrzebna do modelu ARIMA
-        if len(values) < 20:
-            self.last_pred_time = None
-            return values[-1]  # jeśli za mało danych, zwracamy ostatnią wartość
+        # model dopasowujemy w procesie roboczym, dzięki czemu okno nie zamarza
+        # bez zaznaczonego "Dopasuj od nowa" proces roboczy tylko aktualizuje zapamiętany model (filtr Kalmana)
+        # z "Start z zapisanych parametrów" optymalizator startuje od poprzedniego dopasowania tego aktywa
+        # (start "na ciepło" - pomaga głównie modelom z częścią MA; dla AR bywa wolniejszy, więc domyślnie wyłączony)
+        if self.warm_var.get():
+            self.worker.submit(predict_path_warm, values, steps, self.order, self.ticker, self.params_dir,
+                               refit=self.refit_var.get(), window=window)
+        else:
+            self.worker.submit(forecast.predict_path, values, steps, self.order, refit=self.refit_var.get(),
+                               window=window)
+        self._queue_time = None
+        self._fitting = False
+        self.time_label.config(text="⏳ Predykcja w kolejce...")
+        self.root.after(POLL_MS, self._poll_worker)  # zaczynamy nasłuchiwać wyników
+
+    def _poll_worker(self):
+        # odbiór zdarzeń z procesu roboczego (wywoływane cyklicznie przez root.after w wątku GUI)
+        for event in self.worker.poll():
+            kind = event[0]
+            if kind == "started":
+                self._queue_time = event[2]  # ile zadanie czekało, zanim proces zaczął liczyć
+                self.time_label.config(text="⏳ Dopasowanie modelu...")
+            elif kind == "progress":
+                self._fitting = True  # iteracje optymalizatora = pełne dopasowanie (nie sama aktualizacja)
+                self.time_label.config(text=f"⏳ Dopasowanie modelu... iteracja {event[2]}")
+            elif kind == "done":
+                (mean, se), self.last_pred_time = event[2], event[3]
+                TIMINGS.merge(event[4])  # fit, forecast, conf_int zmierzone w procesie roboczym
+                if self._fitting and se is not None:
+                    # zapamiętujemy tylko pełne dopasowania - wynik zależy wtedy wyłącznie od klucza
+                    self.forecast_cache.put(self._cache_key, (mean, se))
+                self._add_prediction(mean, se)
+                self._show_times()
+            elif kind == "error":
+                print("Błąd procesu roboczego:", event[2])
+                self.time_label.config(text="⏱ Czas predykcji: — (błąd)")
+
+        if self.worker.busy:
+            self.root.after(POLL_MS, self._poll_worker)
+
+    def _horizon(self):
+        # liczba kroków prognozy ze Spinboxa (1 - MAX_HORIZON)
+        try:
+            return min(max(int(self.horizon_entry.get()), 1), forecast.MAX_HORIZON)
+        except ValueError:
+            return 1
 
-        series = pd.Series(values)  # zamieniamy listę wartości na pandas Series (wymagane przez ARIMA)
+    def _fit_window(self):
+        # (start, stop) danych do estymacji z pola "Okno dopasowania" (niezależne od okna wykresu), None = wszystko,
+        # False = błędny tekst (komunikat już pokazany)
+        try:
+            return forecast.fit_window(self.fit_window_entry.get(), self.store.dates)
+        except ValueError:
+            tk.messagebox.showwarning(
+                "Błędne okno", "Okno dopasowania: liczba obserwacji albo zakres dat dd.mm.yyyy-dd.mm.yyyy")
+            return False
+
+    def _show_times(self):
+        queue_ms = (self._queue_time or 0.0) * 1000
+        stage = "Dopasowanie" if self._fitting else "Aktualizacja modelu"
+        self._show_stages(f"⏱ Kolejka: {queue_ms:.1f} ms | {stage}: {self.last_pred_time*1000:.1f} ms")
+
+    def _show_stages(self, text):
+        # czas predykcji i w drugiej linii podział na etapy (coa.timing); z COA_DEBUG=1 także na stderr
+        stages = TIMINGS.line()
+        self.time_label.config(text=f"{text}\n{stages}" if stages else text)
+        if DEBUG:
+            print(f"[czasy] {self.crypto_name} ARIMA{self.order}: {stages}", file=sys.stderr)
+
+    def show_timings(self):
+        # okno z podsumowaniem wszystkich predykcji tej sesji: średnia, percentyle i histogram każdego etapu
+        window = tk.Toplevel(self.root)
+        window.title("Czasy etapów predykcji")
+        text = tk.Text(window, width=72, height=16, font=("Courier", 10))
+        text.insert("1.0", TIMINGS.report() if TIMINGS.totals else "Brak pomiarów - wykonaj predykcję.")
+        text.config(state="disabled")
+        text.pack(fill="both", expand=True, padx=10, pady=10)
+
+    def _add_prediction(self, mean, se):
+        self.last_forecast = (mean, se)
+
+        from coa.ingest import time_step
+        last_time = self.store.dates[-1]                                       # ostatnia data z magazynu danych
+        next_times = last_time + np.arange(1, len(mean) + 1) * time_step(self.store.dates)  # kolejne dni (godziny, minuty)
+        self.store.extend(next_times, mean, is_prediction=True)               # dopisanie dat i prognozowanych wartości
+        with span("render"):
+            self.table.refresh()                                      # tabela pokaże nowy wiersz, jeśli jest w widocznym zakresie
+
+            # ---- odśwież wykres po predykcji ----
+            self.refresh_plot()
 
+    # ===============================
+    # Automatyczny dobór rzędu modelu
+    # ===============================
+    def select_order(self):
+        if not len(self.store):
+            tk.messagebox.showwarning("Brak danych", "Najpierw wczytaj dane!")
+            return
+        if self._order_thread is not None and self._order_thread.is_alive():
+            return  # przeszukiwanie już trwa
+
+        # kandydaci liczeni w puli procesów; wątek tylko czeka na wyniki, więc okno nie zamarza
+        values = self.store.values[~self.store.is_prediction].copy()  # tylko dane z pliku, bez prognoz
+        result = {"ticker": self.ticker}
+        if self._order_pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            self._order_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+        self._order_thread = threading.Thread(target=self._search_order, args=(values, result), daemon=True)
+        self._order_thread.start()
+        self.order_label.config(text="⏳ Dobór rzędu...")
+        self.root.after(POLL_MS, self._poll_order, result)
+
+    def _search_order(self, values, result):
+        # wątek przeszukiwania; przy zamykaniu okna pula anuluje zadania - wtedy po prostu nie ma wyniku
         try:
-            # tworzymy model ARIMA z parametrami (p=5, d=1, q=0)
-            model = ARIMA(series, order=(5, 1, 0))
-            model_fit = model.fit()                  # dopasowujemy model do danych
+            result["order"] = select_order_cached(values, result["ticker"], self.orders_dir, refresh=True,
+                                                  executor=self._order_pool)
+        except CancelledError:
+            pass
+        except Exception as e:
+            print("Błąd doboru rzędu:", repr(e))
 
-            forecast = model_fit.get_forecast(steps=1)   # prognoza na 1 krok do przodu
-            predicted_value = forecast.predicted_mean.iloc[0]       # pobieramy prognozowaną wartość
+    def _poll_order(self, result):
+        if self._order_thread.is_alive():
+            self.root.after(POLL_MS, self._poll_order, result)
+            return
+        if result["ticker"] != self.ticker:
+            return  # w międzyczasie wczytano inne dane - ich rząd ustawił już load_data
+        self._set_order(result.get("order", self.order))  # brak wyniku (wyjątek w wątku) - zostaje poprzedni rząd
 
-            conf_int = forecast.conf_int(alpha=0.05) # przdział ufnosci 95%
-            lower = conf_int.iloc[0, 0]  
-            upper = conf_int.iloc[0, 1]  # pierwszy wiersz; druga kolumna
+    def _set_order(self, order):
+        self.order = tuple(order)
+        self.order_label.config(text=f"ARIMA{self.order}")
 
-            end_time = time.perf_counter()  # stop czasu
-            self.last_pred_time = end_time - start_time
-            
-            return predicted_value, (lower, upper)
+    def cancel_prediction(self):
+        if self.worker.cancel():  # zabija proces roboczy w trakcie dopasowania
+            self.time_label.config(text="⏹ Predykcja anulowana")
 
-        except Exception as e:
-            # jeśli coś pójdzie nie tak (np. brak danych, problem z dopasowaniem), zwracamy ostatnią wartość
-            print("Błąd ARIMA:", e)
-            self.last_pred_time = None
-            return values[-1], None
-        
-    
-    def predict_next(self):
-        # sprawdzenie, czy tabela nie jest pusta
-        if not self.table.get_children():
-            tk.messagebox.showwarning("Brak danych", "Najpierw wczytaj dane!")
+    # ===============================
+    # Obserwowanie folderu (nowe wiersze w plikach -> prognozy w tle)
+    # ===============================
+    def toggle_watch(self):
+        if self.watcher is not None:
+            self.watcher = None
+            self.watch_btn.config(text="Obserwuj folder")
+            return
+        directory = filedialog.askdirectory(
+            title="Wybierz folder z plikami CSV",
+            initialdir=os.path.dirname(self.tail.path) if self.tail is not None else None)
+        if not directory:
             return
-        
-        last_time_str = self.table.item(self.table.get_children()[-1])["values"][0]  # pobranie ostatniej daty z tabeli
-        last_time = datetime.strptime(last_time_str, "%d.%m.%Y")
-        next_time = last_time + timedelta(days=1)     # dodajemy 1 dzień
-        next_time_str = next_time.strftime("%d.%m.%Y")
-        
-        pred_value, ci = self.predict()
-        self.last_ci = ci
-        
-        if self.last_pred_time is not None:
-            self.time_label.config(
-                text=f"⏱ Czas predykcji: {self.last_pred_time*1000:.1f} ms")
 
-        self.table.insert("", "end", values=(next_time_str, round(pred_value, 6))) # wstawienie daty i prognozowanej wartości
-        self.predicted += 1
+        from coa.watch import DatasetTracker, FolderWatcher
+        self.watcher = FolderWatcher(directory)
+        self.tracker = DatasetTracker(self.datasets)
+        # stan początkowy wszystkich plików (pełny odczyt, kopie .npy) w wątku w tle - okno nie zamarza;
+        # później tracker czyta z każdego pliku już tylko dopisane wiersze (jak coa.watch z ingest(initial=True))
+        opened = os.path.abspath(self.tail.path) if self.tail is not None else None
+        self._priming = threading.Thread(target=self._prime_tracker, daemon=True,
+                                         args=(self.tracker, [p for p in self.watcher.files() if p != opened]))
+        self._priming.start()
+        self._watch_changed = set()
+        self._watch_id += 1  # poprzednia pętla _poll_folder (jeśli jeszcze trwa) się zakończy
+        self.watch_btn.config(text="Zatrzymaj obserwację")
+        self.root.after(WATCH_MS, self._poll_folder, self._watch_id)
+
+    def _poll_folder(self, watch_id):
+        if self.watcher is None or watch_id != self._watch_id:
+            return  # obserwacja wyłączona albo uruchomiona od nowa
+        priming = self._priming is not None and self._priming.is_alive()
+        for path in self.watcher.poll():
+            if self.tail is not None and path == os.path.abspath(self.tail.path):
+                self.load_appended(forecast_new=True)  # otwarty plik: nowe wiersze w tabeli i na wykresie + prognoza
+            elif priming:
+                self._watch_changed.add(path)  # tracker jeszcze wczytuje pliki - prognoza po wczytaniu
+            else:
+                self._forecast_in_background(path)
+        if not priming and self._watch_changed:
+            for path in sorted(self._watch_changed):
+                self._forecast_in_background(path)
+            self._watch_changed.clear()
+        self._collect_background()
+        self.root.after(WATCH_MS, self._poll_folder, watch_id)
+
+    @staticmethod
+    def _prime_tracker(tracker, paths):
+        # wątek w tle: pełny odczyt każdego pliku folderu, zanim _poll_folder zacznie korzystać z trackera
+        for path in paths:
+            try:
+                tracker.update(path)
+            except Exception as e:
+                print("Błąd odczytu pliku:", e)
+                tracker.forget(path)
+
+    def _forecast_in_background(self, path):
+        # prognoza dla pliku, który nie jest otwarty - wynik trafia do pamięci podręcznej prognoz,
+        # więc po otwarciu tego pliku "Predykcja" pokaże go od razu (te same dane, rząd, horyzont i okno)
+        try:
+            dates, values, tickers, n_new = self.tracker.update(path)
+        except Exception as e:
+            print("Błąd odczytu pliku:", e)
+            self.tracker.forget(path)
+            return
+        if not n_new:
+            return
+        keep = ~np.isnat(dates) & ~np.isnan(values[:, 0])  # jak read_series + SeriesStore.load
+        dates, values, ticker = dates[keep], values[keep, 0], tickers[0]
+        order = OrderStore(self.orders_dir).get(ticker) or forecast.ORDER
+        steps = self._horizon()
+        try:
+            window = forecast.fit_window(self.fit_window_entry.get(), dates)
+        except ValueError:
+            window = None
+        key = forecast_key(values, order, steps, window=window)
+        if self.forecast_cache.get(key) is not None:
+            return
 
-        # ---- odśwież wykres po predykcji ----
-        self.refresh_plot()
+        if self._background is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            self._background = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        if path in self._background_jobs:
+            self._background_jobs[path][0].cancel()  # prognoza dla starszych danych (jeśli jeszcze nie ruszyła)
+        if self.warm_var.get():
+            future = self._background.submit(predict_path_warm, values, steps, order, ticker, self.params_dir,
+                                             window=window)
+        else:
+            future = self._background.submit(forecast.predict_path, values, steps, order, window=window)
+        self._background_jobs[path] = (future, key)
+
+    def _collect_background(self):
+        for path, (future, key) in list(self._background_jobs.items()):
+            if not future.done():
+                continue
+            del self._background_jobs[path]
+            try:
+                mean, se = future.result()
+            except Exception as e:  # także anulowane zadanie
+                print("Błąd prognozy w tle:", e)
+                continue
+            if se is not None:
+                self.forecast_cache.put(key, (mean, se))
+                self.time_label.config(text=f"⏱ Nowa prognoza w tle: {os.path.basename(path)}")
+
+    def on_close(self):
+        if self._background is not None:
+            self._background.shutdown(wait=False, cancel_futures=True)
+        if self._order_pool is not None:
+            self._order_pool.shutdown(wait=False, cancel_futures=True)
+        self.worker.close()
+        self.root.destroy()
 
     # ===============================
     # Odśwież wykres
     # ===============================
     def refresh_plot(self):
-        # jeśli tabela jest pusta, nie rysujemy nic
-        if not self.table.get_children():
+        # jeśli nie ma danych (albo wykres jeszcze nie powstał), nie rysujemy nic
+        if not len(self.store) or self.plot is None:
             return
         
         # pobranie liczby punktów do wyświetlenia z Entry
@@ -278,95 +644,16 @@ class CryptoOracleApp:
         except ValueError:
             window_size = 200  # jeśli wpisano coś nieprawidłowego ustawiamy 200
             
-        # pobieramy wszystkie wartości z tabeli
-        time_col = [self.table.item(item)["values"][0] for item in self.table.get_children()]
-        value_col = []
-
-        for item in self.table.get_children():
-            try:
-                value_col.append(float(str(self.table.item(item)["values"][1]).replace(",", ".")))
-            except ValueError:
-                pass
-
-        # wybieramy tylko ostatnie 'window_size' punktów, jeśli mamy ich więcej
-        time_window = time_col[-window_size:] if len(time_col) > window_size else time_col
-        value_window = value_col[-window_size:] if len(value_col) > window_size else value_col
-        
-        # czyścimy aktualny wykres
-        self.ax.clear()
-        
-        # konwertujemy stringi dat na obiekty datetime dla Matplotlib
-        dates_window = [datetime.strptime(d, "%d.%m.%Y") for d in time_window]
-        
-        # obliczamy ile punktów to dane oryginalne (niepredykcyjne)
-        original_len = len(dates_window) - min(self.predicted, len(dates_window))
-        # rysujemy niebieską linię dla danych oryginalnych
-        if original_len > 0:
-            self.ax.plot(dates_window[:original_len], value_window[:original_len], color='blue', linestyle='-')
-
-        if self.predicted > 0:
-            # ---- ostatnia data i wartość predykcji ----
-            pred_date = dates_window[-1]
-            pred_value = value_window[-1]
-            lower = upper = None
-            
-            # ---- przedział ufności ----
-            if self.last_ci is not None:
-                lower, upper = self.last_ci
-                
-                self.ax.vlines(
-                    x=pred_date,
-                    ymin=lower,
-                    ymax=upper,
-                    colors="#FA8078",
-                    linestyles="dashed",
-                    linewidth=1.5,
-                    alpha=0.8)
-            
-            # ---- tekst do wyświetlenia przy predykcji ----
-            if lower is not None:
-                label = f"Predykcja\n{pred_value:.4f}\nCI: [{lower:.2f}, {upper:.2f}]"
-            else:
-                label = f"Predykcja\n{pred_value:.4f}"
-            # ---- dodanie adnotacji z wartością predykcji ----
-            self.ax.annotate(
-                label,                           # tekst adnotacji
-                xy=(pred_date, pred_value),      # punkt, do którego strzałka będzie wskazywać
-                xytext=(15, 15),                 # przesunięcie tekstu względem punktu
-                textcoords="offset points",      # mówi Matplotlib, że przesunięcie (15, 15) jest w punktach (points), a nie np. w jednostkach danych osi X/Y
-                bbox=dict(                       # obramowanie tekstu
-                    boxstyle="round,pad=0.4",
-                    fc="#D5F5F7",            # kolor tła
-                    ec="#E02519",            # kolor obramowania
-                    lw=1
-                    ),
-                arrowprops=dict(                 # strzałka wskazująca punkt
-                    arrowstyle="->",
-                    color="#E02519"
-                    ),
-                fontsize=9)                      # rozmiar czcionki
-            
-
-            # ---- czerwone kropki dla wszystkich predykcji (bez łączenia z poprzednią linią) ----
-            self.ax.plot(dates_window[original_len:], value_window[original_len:], color='red', marker='o', markersize=6, linestyle='')
-            # ---- linia łącząca ostatni punkt danych oryginalnych z pierwszą predykcją ----
-            self.ax.plot(dates_window[original_len-1:], value_window[original_len-1:], color='red', marker='', markersize=6, linestyle='-')
-
-        # ---- reszta wykresu ----
-        self.ax.set_title(f"{self.crypto_name}")  # tytuł wykresu
-        self.ax.set_xlabel("Time")                # etykieta osi X
-        self.ax.set_ylabel("Value")               # etykieta osi Y
-        self.ax.grid(True)
-
-        self.ax.xaxis.set_major_locator(mdates.MonthLocator(interval=3))  # Ustawia, co ile mają być główne ticki na osi X (daty)
-        self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %Y'))  # Formatuje etykiety ticków, czyli jak będą wyglądać daty na osi X.
-        self.fig.autofmt_xdate(rotation=45)                               # Automatycznie obraca i dopasowuje etykiety osi X, żeby się nie nakładały.
+        # ostatnie 'window_size' punktów z pliku + prognozy (widoki tablic NumPy, daty już jako datetime64);
+        # okno nie przesuwa się przy predykcji, więc wykres dorysowuje tylko nakładkę na zapamiętanym tle
+        dates_window, value_window, pred_window = self.store.tail_observed(window_size)
 
-        self.canvas.draw()  # Odświeża Tkinterowy widget wykresu, żeby pokazał wszystkie zmiany
+        # wykres tylko podmienia dane istniejących linii (bez ax.clear()) i odświeża to, co się zmieniło
+        self.plot.update(dates_window, value_window, pred_window, self.last_forecast, self.crypto_name)
     
     def export_plot(self):
     # jeśli nie ma danych – nie zapisujemy
-        if not self.table.get_children():
+        if not len(self.store) or self.plot is None:
             tk.messagebox.showwarning("Brak danych", "Nie ma wykresu do zapisania!")
             return
 
@@ -386,7 +673,8 @@ class CryptoOracleApp:
             return
               # user kliknął Anuluj
         try:
-            self.fig.savefig(file_path, dpi=300, bbox_inches="tight")
+            with span("export"):
+                self.plot.save(file_path, dpi=300, bbox_inches="tight")
             tk.messagebox.showinfo("Sukces", f"Wykres zapisany:\n{file_path}")
         except Exception as e:
             tk.messagebox.showerror("Błąd", f"Nie udało się zapisać wykresu:\n{e}")
@@ -0,0 +1,3 @@
+# -------------------
+# Skrypty pomiarowe - uruchamiane z katalogu głównego: python -m benchmarks.<nazwa>
+# -------------------
@@ -0,0 +1,48 @@
+# -------------------
+# Skalowanie prognoz wielu kolumn w puli procesów
+# Uruchomienie: python -m benchmarks.bench_batch [--columns 200] [--workers 1 2 4]
+# -------------------
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from coa.batch import forecast_all
+from coa.ingest import read_prices
+
+
+def make_columns(file_path, n_columns, seed=0):
+    # powiela kolumny z pliku z losowym szumem (±1%), żeby każdy model był dopasowywany osobno
+    dates, values, tickers = read_prices(file_path)
+    rng = np.random.default_rng(seed)
+    picks = np.arange(n_columns) % values.shape[1]
+    noise = 1 + 0.01 * rng.standard_normal((values.shape[0], n_columns))
+    return dates, values[:, picks] * noise, [f"{tickers[p]}#{i}" for i, p in enumerate(picks)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--file", default="Data/crypto_prices.csv")
+    parser.add_argument("--columns", type=int, default=100)
+    parser.add_argument("--workers", type=int, nargs="+")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    workers_list = args.workers or sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1)))
+    dates, values, tickers = make_columns(args.file, args.columns)
+
+    print(f"{args.columns} kolumn x {len(dates)} wierszy, rdzenie: {cores}")
+    print(f"{'procesy':>8}{'czas [s]':>12}{'kolumny/s':>12}{'przyspieszenie':>16}")
+    base = None
+    for workers in workers_list:
+        start = time.perf_counter()
+        forecast_all(dates, values, tickers, workers=workers)
+        elapsed = time.perf_counter() - start
+        base = base or elapsed
+        print(f"{workers:>8}{elapsed:>12.2f}{args.columns / elapsed:>12.1f}{base / elapsed:>15.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# -------------------
+# Szybka ścieżka AR(p) na różnicach (coa.fast_ar) vs dopasowanie statsmodels (forecast.predict_path)
+# Uruchomienie: python -m benchmarks.bench_fast_ar [--order 5 1 0] [--horizon 7] [--repeat 5] [pliki.csv ...]
+# -------------------
+# Czas estymacji + prognozy oraz zgodność wyników: największa względna różnica prognoz i błędów standardowych
+# oraz błąd prognozy t+1 (MAE) z ostatnich --holdout dni dla obu ścieżek (dopasowanie co dzień, bez podglądania).
+
+import argparse
+import glob
+import time
+import warnings
+
+import numpy as np
+
+from coa import forecast
+from coa.fast_ar import METHODS, predict_path_fast
+from coa.ingest import read_series
+
+
+def timed(func, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def holdout_mae(values, holdout, predict):
+    errors = [predict(values[:t])[0][0] - values[t] for t in range(len(values) - holdout, len(values))]
+    return float(np.mean(np.abs(errors)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--order", type=int, nargs=3, default=forecast.ORDER, metavar=("P", "D", "Q"))
+    parser.add_argument("--horizon", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--holdout", type=int, default=30)
+    args = parser.parse_args()
+    paths = args.paths or sorted(set(glob.glob("Data/*_prices.csv")) - {"Data/crypto_prices.csv"})
+    import statsmodels.tsa.arima.model  # noqa: F401 - statsmodels przy imporcie włącza "always" dla swoich ostrzeżeń
+    warnings.simplefilter("ignore")
+    order = tuple(args.order)
+    print(f"ARIMA{order}, horyzont: {args.horizon}")
+
+    print(f"{'plik':<22}{'metoda':>8}{'czas [ms]':>12}{'przysp.':>10}{'max Δ prognozy':>17}{'max Δ błędu':>14}"
+          f"{f'MAE t+1 ({args.holdout} dni)':>22}")
+    for path in paths:
+        _, values, _ = read_series(path)
+        ref_time, (ref_mean, ref_se) = timed(lambda: forecast.predict_path(values, args.horizon, order), args.repeat)
+        ref_mae = holdout_mae(values, args.holdout, lambda v: forecast.predict_path(v, 1, order))
+        print(f"{path:<22}{'mle':>8}{ref_time * 1000:>12.2f}{'1.0x':>10}{'-':>17}{'-':>14}{ref_mae:>22.6g}")
+
+        for method in METHODS:
+            fast_time, (mean, se) = timed(lambda: predict_path_fast(values, args.horizon, order, method), args.repeat)
+            mae = holdout_mae(values, args.holdout, lambda v: predict_path_fast(v, 1, order, method))
+            d_mean = np.max(np.abs(mean - ref_mean) / np.abs(ref_mean))
+            d_se = np.max(np.abs(se - ref_se) / ref_se) if se is not None and ref_se is not None else np.nan
+            print(f"{'':<22}{method:>8}{fast_time * 1000:>12.2f}{f'{ref_time / fast_time:.0f}x':>10}"
+                  f"{d_mean:>17.2e}{d_se:>14.2e}{mae:>22.6g}")
+
+
+if __name__ == "__main__":
+    main()
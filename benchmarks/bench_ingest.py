@@ -0,0 +1,51 @@
+# -------------------
+# Benchmark wczytywania CSV: stara ścieżka (iterrows + strptime) vs coa.ingest vs kopia binarna (coa.dataset_cache)
+# Uruchomienie: python -m benchmarks.bench_ingest [pliki.csv ...]
+# -------------------
+
+import glob
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from coa.dataset_cache import DatasetCache
+from coa.ingest import read_series
+
+
+def legacy_load(file_path):
+    # odtworzenie dawnego load_data + refresh_plot (bez Tkintera)
+    df = pd.read_csv(file_path, sep=";")
+    time_col, value_col = df.columns[0], df.columns[1]
+    rows = [(row[time_col], row[value_col]) for _, row in df.iterrows()]
+    values = [float(str(v).replace(",", ".")) for _, v in rows]
+    dates = [datetime.strptime(d, "%d.%m.%Y") for d, _ in rows]
+    return dates, values
+
+
+def best_time(func, file_path, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(file_path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(paths, repeat=5):
+    cache = DatasetCache(tempfile.mkdtemp(prefix="coa-bench-"))
+    print(f"{'plik':<28}{'wiersze':>9}{'stara [wiersze/s]':>20}{'nowa [wiersze/s]':>20}{'przyspieszenie':>16}"
+          f"{'kopia bin. [ms]':>17}{'CSV [ms]':>10}")
+    for path in paths:
+        n_rows = len(read_series(path, cache=cache)[0])  # przy okazji zapisuje kopię binarną
+        old = best_time(legacy_load, path, repeat)
+        new = best_time(read_series, path, repeat)
+        binary = best_time(lambda p: read_series(p, cache=cache), path, repeat)
+        print(f"{path:<28}{n_rows:>9}{n_rows / old:>20,.0f}{n_rows / new:>20,.0f}{old / new:>15.1f}x"
+              f"{binary * 1000:>17.2f}{new * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or sorted(glob.glob("Data/*.csv")))
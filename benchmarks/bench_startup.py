@@ -0,0 +1,63 @@
+# -------------------
+# Czas zimnego startu GUI (na podstawie python -X importtime)
+# Uruchomienie: python -m benchmarks.bench_startup [--repeat 5] [--json wynik.json]
+# -------------------
+# Mierzy osobno to, co blokuje pokazanie okna (import MAIN), i to, co MAIN odkłada na później:
+# importy w wątku w tle (MAIN.DEFERRED_IMPORTS) oraz w procesie roboczym (MAIN.WORKER_IMPORTS).
+
+import argparse
+import json
+import subprocess
+import sys
+
+
+def import_time(statement):
+    # Uruchamia nowy interpreter i zwraca (łączny czas importów [ms], 5 najdroższych modułów najwyższego poziomu)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                          capture_output=True, text=True, check=True)
+    top_level = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        if not name.startswith("  "):   # moduły najwyższego poziomu (zagnieżdżone mają wcięcie)
+            top_level.append((name.strip(), int(cumulative_us) / 1000))
+    total = sum(ms for _, ms in top_level)
+    return total, sorted(top_level, key=lambda item: -item[1])[:5]
+
+
+def best_of(statement, repeat):
+    runs = [import_time(statement) for _ in range(repeat)]
+    return min(runs, key=lambda run: run[0])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="zapis wyników do pliku JSON")
+    args = parser.parse_args()
+
+    import MAIN
+    stages = {
+        "okno (import MAIN)": "import MAIN",
+        "w tle (DEFERRED_IMPORTS)": "import MAIN; MAIN.warm_imports()",
+        "proces roboczy (WORKER_IMPORTS)": "; ".join(f"import {name}" for name in MAIN.WORKER_IMPORTS),
+    }
+    report = {}
+    window_ms = None
+    for label, statement in stages.items():
+        total, top = best_of(statement, args.repeat)
+        if window_ms is None:
+            window_ms = total
+        elif label.startswith("w tle"):
+            total -= window_ms  # tylko to, co dochodzi ponad import MAIN
+        report[label] = {"ms": round(total, 1), "top": [[name, round(ms, 1)] for name, ms in top]}
+        print(f"{label:<34}{total:>9.1f} ms   " + ", ".join(f"{name} {ms:.0f}" for name, ms in top[:3]))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+# -------------------
+# Zestaw pomiarów: wczytanie, predykcja, odświeżenie wykresu (Agg, bez okna) i eksport - raport JSON
+# Uruchomienie: python -m benchmarks.bench_suite [--sizes 2000 20000 ...] [--assets 1 4] [--json wynik.json]
+#               python -m benchmarks.bench_suite --sizes 2000 20000 --compare poprzedni.json
+# -------------------
+# Etapy odpowiadają funkcjom GUI: load_data (read_series + SeriesStore.load, z CSV i z kopii binarnej),
+# predict (statsmodels, szybka ścieżka AR, coa.batch dla wielu aktywów), refresh_plot (pierwsze rysowanie
+# i odświeżenie nakładki) oraz export_plot (300 dpi, jak w GUI). Dane są syntetyczne (coa.synthetic, dane minutowe,
+# stały seed), więc wyniki z różnych commitów można porównywać (--compare). Duże rozmiary (>= 1M) mierzone są raz.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from coa.synthetic import write_csv
+
+SIZES = (2_000, 20_000, 200_000, 2_000_000, 10_000_000)
+ASSETS = (1, 4)
+MAX_FIT = 200_000     # powyżej dopasowanie statsmodels trwa minuty - mierzymy tylko szybką ścieżkę
+FREQ = "minute"       # 10 mln punktów dziennych nie zmieści się w zakresie dat pandas
+SEED = 0
+
+
+def synthetic(n, k):
+    # te same dane, które synthetic.write_csv zapisuje do pliku (ten sam seed i podział na porcje)
+    from coa import synthetic
+    chunks = list(synthetic.generate(n, k, FREQ, seed=SEED))
+    return (np.concatenate([dates for dates, _ in chunks]), np.concatenate([values for _, values in chunks]),
+            synthetic.tickers(k))
+
+
+def best_time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def environment():
+    import matplotlib
+    import statsmodels
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "statsmodels": statsmodels.__version__,
+        "matplotlib": matplotlib.__version__,
+    }
+
+
+# ===============================
+# Etapy
+# ===============================
+def bench_load(path, directory, repeat):
+    from coa.dataset_cache import DatasetCache
+    from coa.ingest import read_series
+    from coa.store import SeriesStore
+
+    store = SeriesStore()
+    cache = DatasetCache(directory)
+    cache.read_prices(path)  # zapis kopii binarnej (poza pomiarem)
+    return {
+        "load_csv": best_time(lambda: store.load(*read_series(path)[:2]), repeat),
+        "load_binary": best_time(lambda: store.load(*read_series(path, cache=cache)[:2]), repeat),
+    }
+
+
+def bench_predict(dates, values, tickers, max_fit, repeat):
+    from coa import forecast
+    from coa.batch import forecast_all
+    from coa.fast_ar import predict_path_fast
+
+    n, k = values.shape
+    results = {"predict_fast": best_time(lambda: predict_path_fast(values[:, 0], 1), repeat)}
+    if n <= max_fit:
+        results["predict_mle"] = best_time(lambda: forecast.predict_path(values[:, 0], 1), repeat)
+        if k > 1:
+            results["predict_batch"] = best_time(lambda: forecast_all(dates, values, tickers), repeat)
+    return results
+
+
+def bench_plot(dates, series, directory, repeat):
+    import matplotlib.style
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from coa.fast_ar import predict_path_fast
+    from coa.ingest import time_step
+    from coa.plot import PricePlot
+    from coa.store import SeriesStore
+    matplotlib.style.use("ggplot")
+
+    store = SeriesStore()
+    store.load(dates, series)
+    mean, se = predict_path_fast(series, 7)
+    store.extend(dates[-1] + np.arange(1, 8) * time_step(dates), mean, is_prediction=True)
+
+    def first_draw():
+        fig = Figure(figsize=(10, 5), dpi=100)  # jak okno GUI (ok. 1000 x 500 pikseli na wykres)
+        plot = PricePlot(fig, FigureCanvasAgg(fig))
+        plot.update(*store.tail(len(store)), (mean, se), "benchmark")
+        return plot
+
+    plot = first_draw()
+    export_path = os.path.join(directory, "export.png")
+    return {
+        "render_full": best_time(first_draw, repeat),
+        "render_refresh": best_time(lambda: plot.update(*store.tail(len(store)), (mean, se), "benchmark"), repeat),
+        "export": best_time(lambda: plot.save(export_path, dpi=300, bbox_inches="tight"), repeat),
+    }
+
+
+# ===============================
+# Porównanie z poprzednim raportem
+# ===============================
+def compare(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["stage"], r["n"], r["assets"]): r["seconds"] for r in json.load(f)["results"]}
+    print(f"\n{'etap':<16}{'n':>12}{'aktywa':>8}{'teraz [ms]':>13}{'wcześniej [ms]':>16}{'zmiana':>9}")
+    for r in results:
+        old = baseline.get((r["stage"], r["n"], r["assets"]))
+        if old:
+            print(f"{r['stage']:<16}{r['n']:>12}{r['assets']:>8}{r['seconds'] * 1000:>13.2f}{old * 1000:>16.2f}"
+                  f"{r['seconds'] / old:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="długości szeregu")
+    parser.add_argument("--assets", type=int, nargs="+", default=ASSETS, help="liczby kolumn (aktywów) w pliku")
+    parser.add_argument("--max-fit", type=int, default=MAX_FIT, help="największy szereg dla dopasowania statsmodels")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="zapis raportu do pliku JSON")
+    parser.add_argument("--compare", help="poprzedni raport JSON do porównania")
+    args = parser.parse_args()
+    import statsmodels.tsa.arima.model  # noqa: F401 - statsmodels przy imporcie włącza "always" dla swoich ostrzeżeń
+    warnings.simplefilter("ignore")
+
+    results = []
+    print(f"{'etap':<16}{'n':>12}{'aktywa':>8}{'czas [ms]':>12}")
+    with tempfile.TemporaryDirectory(prefix="coa-bench-") as directory:
+        for k in args.assets:
+            for n in args.sizes:
+                repeat = 1 if n >= 1_000_000 else args.repeat
+                dates, values, tickers = synthetic(n, k)
+                path = os.path.join(directory, f"prices_{n}_{k}.csv")
+                write_csv(path, n, k, FREQ, seed=SEED)
+
+                stages = bench_load(path, os.path.join(directory, "datasets"), repeat)
+                os.remove(path)
+                stages.update(bench_predict(dates, values, tickers, args.max_fit, repeat))
+                if k == 1:  # wykres pokazuje jedną kryptowalutę
+                    stages.update(bench_plot(dates, values[:, 0], directory, repeat))
+
+                for stage, seconds in stages.items():
+                    results.append({"stage": stage, "n": n, "assets": k, "seconds": seconds, "repeat": repeat})
+                    print(f"{stage:<16}{n:>12}{k:>8}{seconds * 1000:>12.2f}")
+                sys.stdout.flush()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2, ensure_ascii=False)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
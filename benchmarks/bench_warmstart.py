@@ -0,0 +1,52 @@
+# -------------------
+# Dopasowanie "na zimno" vs "na ciepło" (start_params z dopasowania na starszych danych)
+# Uruchomienie: python -m benchmarks.bench_warmstart [--order 2 1 2] [--new-days 30] [--repeat 3] [pliki.csv ...]
+# -------------------
+# Scenariusz: model dopasowano, gdy w pliku brakowało ostatnich N dni; teraz doszły nowe dane.
+
+import argparse
+import glob
+import time
+import warnings
+
+from coa import forecast
+from coa.ingest import read_series
+
+
+def timed_fit(values, order, start_params, repeat):
+    best, results = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = forecast.fit_arima(values, order, start_params=start_params)
+        best = min(best, time.perf_counter() - start)
+    return best, results.mle_retvals
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--new-days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--order", type=int, nargs=3, default=forecast.ORDER, metavar=("P", "D", "Q"))
+    args = parser.parse_args()
+    paths = args.paths or sorted(set(glob.glob("Data/*_prices.csv")) - {"Data/crypto_prices.csv"})
+    import statsmodels.tsa.arima.model  # noqa: F401 - statsmodels przy imporcie włącza "always" dla swoich ostrzeżeń
+    warnings.simplefilter("ignore")     # ConvergenceWarning statsmodels zaciemnia tabelę
+    order = tuple(args.order)
+    print(f"ARIMA{order}, nowe dni: {args.new_days}")
+
+    print(f"{'plik':<22}{'iteracje zimno':>16}{'iteracje ciepło':>17}{'wyw. f. zimno':>15}{'wyw. f. ciepło':>16}"
+          f"{'czas zimno [ms]':>17}{'czas ciepło [ms]':>18}")
+    for path in paths:
+        _, values, _ = read_series(path)
+        old_params = forecast.fit_arima(values[:-args.new_days], order).params.to_numpy()
+
+        cold_time, cold = timed_fit(values, order, None, args.repeat)
+        warm_time, warm = timed_fit(values, order, old_params, args.repeat)
+        print(f"{path:<22}{cold.get('iterations', '-'):>16}{warm.get('iterations', '-'):>17}"
+              f"{cold.get('fcalls', '-'):>15}{warm.get('fcalls', '-'):>16}"
+              f"{cold_time * 1000:>17.1f}{warm_time * 1000:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
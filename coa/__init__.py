@@ -0,0 +1,5 @@
+# -------------------
+# Crypto Oracle Analytics (COA) - logika niezależna od GUI
+# -------------------
+# Moduły pakietu (poza coa.widgets i coa.plot) nie importują tkintera ani matplotlib,
+# dzięki czemu mogą być używane zarówno przez MAIN.py, jak i w trybie bez okna.
@@ -0,0 +1,122 @@
+# -------------------
+# Prognozy bez GUI (cron, serwery): python -m coa Data/BTC_prices.csv Data/ETH_prices.csv --horizon 7
+# -------------------
+# Ciężkie biblioteki (pandas, statsmodels) importujemy dopiero po sprawdzeniu argumentów,
+# więc --help i błędy w argumentach odpowiadają od razu. tkinter i matplotlib nie są importowane wcale.
+# Domyślne wartości i limity bierzemy z coa.forecast (importuje tylko numpy) - te same co w GUI.
+
+import argparse
+import os
+import sys
+import time
+
+from coa import forecast
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m coa",
+        description="Prognozy ARIMA dla plików CSV w formacie Crypto Oracle Analytics (Ticker;XXX-USD, dd.mm.yyyy).")
+    parser.add_argument("paths", nargs="+", help="pliki CSV (jedna lub wiele kolumn z cenami)")
+    parser.add_argument("--horizon", type=int, default=1, help="liczba dni prognozy (domyślnie 1)")
+    parser.add_argument("--order", type=int, nargs=3, default=forecast.ORDER, metavar=("P", "D", "Q"),
+                        help=f"rząd modelu ARIMA (domyślnie {' '.join(map(str, forecast.ORDER))})")
+    parser.add_argument("--auto-order", action="store_true",
+                        help="dobierz rząd dla każdego tickera przeszukiwaniem siatki (zapamiętany na kolejne uruchomienia)")
+    parser.add_argument("--criterion", choices=("aic", "bic"), default="aic",
+                        help="kryterium doboru rzędu dla --auto-order (domyślnie aic)")
+    parser.add_argument("--order-margin", type=float, metavar="PUNKTY",
+                        help="--auto-order z przesiewem: pełne dopasowanie tylko kandydatów gorszych od najlepszego po kilku"
+                             " iteracjach o najwyżej tyle punktów kryterium (szybciej, ale wybrany rząd może nie być"
+                             " najlepszy; domyślnie pełne przeszukanie)")
+    parser.add_argument("--fast", nargs="?", const="ols", choices=("ols", "yw"),
+                        help="rzędy bez części MA (q = 0): AR(p) na różnicach w postaci zamkniętej (OLS lub Yule-Walker)"
+                             " zamiast dopasowania statsmodels")
+    parser.add_argument("--fit-window", metavar="OKNO",
+                        help="dane do estymacji: ostatnie N obserwacji (np. 365) albo zakres dat dd.mm.yyyy-dd.mm.yyyy"
+                             " (domyślnie cała historia)")
+    parser.add_argument("--alpha", type=float, default=forecast.ALPHA,
+                        help=f"poziom istotności przedziału ufności (domyślnie {forecast.ALPHA})")
+    parser.add_argument("--format", choices=("csv", "json"), default="csv", help="format wyniku (domyślnie csv)")
+    parser.add_argument("--output", "-o", help="plik wynikowy (domyślnie standardowe wyjście)")
+    parser.add_argument("--workers", type=int, help="liczba procesów (domyślnie liczba rdzeni)")
+    parser.add_argument("--cache", action="store_true",
+                        help="używaj pamięci podręcznej prognoz i binarnych kopii plików na dysku (katalog z COA_CACHE_DIR lub ~/.cache)")
+    parser.add_argument("--warm-start", action="store_true",
+                        help="startuj dopasowania od zapisanych parametrów poprzednich dopasowań (i zapisuj nowe)")
+    parser.add_argument("--metrics-file", metavar="PLIK",
+                        help="metryki przebiegu (liczniki, czasy etapów) w formacie Prometheusa, np. dla textfile collectora")
+    parser.add_argument("--verbose", "-v", action="store_true",
+                        help="czasy poszczególnych etapów na stderr (wczytanie, dopasowanie, prognoza, przedziały)")
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.horizon <= forecast.MAX_HORIZON:
+        parser.error(f"--horizon musi być z zakresu 1-{forecast.MAX_HORIZON}")
+    if args.order_margin is not None and (not args.auto_order or args.order_margin < 0):
+        parser.error("--order-margin: nieujemna liczba, tylko razem z --auto-order")
+    if args.fit_window:
+        try:
+            forecast.fit_window(args.fit_window, [])  # tylko sprawdzenie składni (daty parsowane jak w plikach CSV)
+        except ValueError:
+            parser.error("--fit-window: podaj liczbę obserwacji albo zakres dat dd.mm.yyyy-dd.mm.yyyy")
+    for path in args.paths:
+        if not os.path.isfile(path):
+            parser.error(f"nie ma pliku: {path}")
+    return args
+
+
+def main(argv=None):
+    start = time.perf_counter()
+    args = parse_args(argv)
+
+    import pandas as pd
+    from coa.batch import forecast_file
+    from coa.cache import ForecastCache, default_cache_dir
+    from coa.dataset_cache import DatasetCache
+    from coa.ingest import date_format
+    imported = time.perf_counter()
+
+    cache = ForecastCache(directory=os.path.join(default_cache_dir(), "forecasts")) if args.cache else None
+    datasets = DatasetCache(os.path.join(default_cache_dir(), "datasets")) if args.cache else None
+    params_dir = os.path.join(default_cache_dir(), "params") if args.warm_start else None
+    orders_dir = os.path.join(default_cache_dir(), "orders") if args.auto_order else None
+    frames = []
+    for path in args.paths:
+        frame = forecast_file(path, args.horizon, tuple(args.order), args.alpha, args.workers, cache, params_dir,
+                              orders_dir, args.criterion, args.fast, args.fit_window, datasets, args.order_margin)
+        frame.insert(0, "file", os.path.splitext(os.path.basename(path))[0])  # jak crypto_name w GUI
+        frames.append(frame)
+    result = pd.concat(frames, ignore_index=True)
+    result["date"] = result["date"].dt.strftime(date_format(result["date"].to_numpy()))
+    computed = time.perf_counter()
+
+    # ---- zapis wyniku ----
+    from coa.metrics import METRICS, inc
+    from coa.timing import span
+    with span("export"):
+        if args.format == "json":
+            text = result.to_json(orient="records", indent=2, force_ascii=False) + "\n"
+        else:
+            text = result.to_csv(sep=";", index=False)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+        else:
+            sys.stdout.write(text)
+    inc("exports", format=args.format)
+    if args.metrics_file:
+        METRICS.write(args.metrics_file)
+
+    if args.verbose:
+        from coa.timing import TIMINGS
+        print(f"import: {(imported - start) * 1000:.0f} ms | prognozy: {(computed - imported) * 1000:.0f} ms"
+              f" | razem: {(time.perf_counter() - start) * 1000:.0f} ms", file=sys.stderr)
+        print(TIMINGS.report(), file=sys.stderr)
+        if cache is not None:
+            print(f"pamięć podręczna: {cache.hits} trafień, {cache.misses} chybień"
+                  f" | kopie binarne plików: {datasets.hits} trafień, {datasets.misses} chybień", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
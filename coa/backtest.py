@@ -0,0 +1,154 @@
+# -------------------
+# Test wsteczny prognoz (walk-forward): python -m coa.backtest Data/ETH_prices.csv --horizon 7
+# -------------------
+# Prognozy z kolejnych punktów historii (rolling origin) porównane z tym, co faktycznie nastąpiło.
+# Zamiast tysięcy dopasowań: parametry estymujemy raz na blok punktów startowych (tylko na danych sprzed bloku),
+# a stan modelu w każdym punkcie bierzemy z jednego przebiegu filtru Kalmana po całym szeregu.
+# Prognozy na 1..h kroków liczymy z przefiltrowanego stanu wektorowo dla wszystkich punktów naraz;
+# bloki (osobne dopasowania) liczą się równolegle w puli procesów.
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from coa import forecast
+
+TRAIN = 365         # domyślna liczba obserwacji przed pierwszym punktem startowym
+
+
+def _at(matrix, base_ndim, t):
+    # macierz modelu stanowego w chwilach t (tablica); macierze stałe w czasie - bez zmian
+    matrix = np.asarray(matrix)
+    if matrix.ndim == base_ndim:
+        return matrix
+    return np.moveaxis(matrix[..., np.minimum(t, matrix.shape[-1] - 1)], -1, 0)
+
+
+def state_forecasts(results, origins, steps):
+    # Prognozy na 1..steps kroków ze stanu przefiltrowanego w chwilach origins (tablica indeksów):
+    # zwraca (prognozy, błędy standardowe) - tablice (len(origins), steps). Bez pętli po punktach startowych.
+    ssm = results.model.ssm
+    Z, T, R, Q = (np.asarray(ssm[name]) for name in ("design", "transition", "selection", "state_cov"))
+    H = float(np.asarray(ssm["obs_cov"]).ravel()[0])
+    Z, RQR = Z.reshape(-1), R @ Q @ R.T
+
+    a = results.filtered_state[:, origins].T                          # (m, k)
+    P = np.moveaxis(results.filtered_state_cov[:, :, origins], -1, 0)  # (m, k, k)
+    mean = np.empty((len(origins), steps))
+    var = np.empty((len(origins), steps))
+    for j in range(steps):
+        t = origins + j + 1
+        a = a @ T.T + np.broadcast_to(_at(ssm["state_intercept"], 1, t), a.shape)
+        P = T @ P @ T.T + RQR
+        mean[:, j] = a @ Z + np.reshape(_at(ssm["obs_intercept"], 1, t), -1)
+        var[:, j] = np.einsum("i,mij,j->m", Z, P, Z) + H
+    return mean, np.sqrt(np.maximum(var, 0.0))
+
+
+def _run_block(task):
+    # Zadanie dla jednego procesu z puli: dopasowanie na values[:fit_end], prognozy z punktów origins
+    values, order, fit_end, origins, steps = task
+    try:
+        params = forecast.fit_arima(values[:fit_end], order).params
+        from statsmodels.tsa.arima.model import ARIMA
+        model = ARIMA(pd.Series(values[:origins[-1] + 1]), order=order)  # filtr nie widzi danych po ostatnim punkcie
+        return state_forecasts(model.filter(params), origins, steps)
+    except Exception as e:
+        print("Błąd ARIMA:", e)
+        mean = np.repeat(values[origins][:, None], steps, axis=1)  # jak predict_path: ostatnia wartość, bez przedziału
+        return mean, np.full(mean.shape, np.nan)
+
+
+# ===============================
+# Test wsteczny jednego szeregu
+# ===============================
+def backtest(values, steps=1, order=forecast.ORDER, train=TRAIN, refit_every=None, workers=None):
+    # Punkty startowe: train-1, train, ..., n-steps-1 (z każdego znamy wszystkie steps rzeczywistych wartości).
+    # refit_every=None - jedno dopasowanie na pierwszych train obserwacjach; N - ponowna estymacja co N punktów
+    # (każda na danych sprzed swojego bloku). workers=None -> liczba rdzeni, workers=1 -> bez puli.
+    # Zwraca DataFrame: origin (indeks), step, actual, forecast, se (NaN, gdy model się nie dopasował)
+    values = np.asarray(values, dtype=np.float64)
+    order = tuple(order)
+    train = max(train, forecast.MIN_OBS)
+    origins = np.arange(train - 1, len(values) - steps)
+    if not len(origins):
+        raise ValueError(f"Za mało danych: potrzeba co najmniej {train + steps} obserwacji")
+
+    block = refit_every or len(origins)
+    tasks = [(values, order, int(chunk[0]) + 1, chunk, steps)
+             for chunk in np.split(origins, np.arange(block, len(origins), block))]
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers == 1:
+        computed = list(map(_run_block, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            computed = list(pool.map(_run_block, tasks))
+
+    mean = np.concatenate([m for m, _ in computed])
+    se = np.concatenate([s for _, s in computed])
+    idx = origins[:, None] + np.arange(1, steps + 1)
+    return pd.DataFrame({
+        "origin": np.repeat(origins, steps),
+        "step": np.tile(np.arange(1, steps + 1), len(origins)),
+        "actual": values[idx].ravel(),
+        "forecast": mean.ravel(),
+        "se": se.ravel(),
+    })
+
+
+def summarize(frame, alpha=forecast.ALPHA):
+    # Błędy per krok prognozy: MAE, RMSE, MAPE [%] i pokrycie przedziału (1 - alpha) [%]
+    lower, upper = forecast.interval(frame["forecast"].to_numpy(), frame["se"].to_numpy(), alpha)
+    error = frame["actual"] - frame["forecast"]
+    scored = frame.assign(
+        abs_error=error.abs(),
+        sq_error=error ** 2,
+        ape=(error / frame["actual"]).abs() * 100,
+        covered=np.where(np.isnan(frame["se"]), np.nan, (frame["actual"] >= lower) & (frame["actual"] <= upper)),
+    )
+    summary = scored.groupby("step").agg(
+        n=("actual", "size"), mae=("abs_error", "mean"), rmse=("sq_error", "mean"), mape=("ape", "mean"),
+        coverage=("covered", "mean"))
+    summary["rmse"] = np.sqrt(summary["rmse"])
+    summary["coverage"] *= 100
+    return summary.reset_index()
+
+
+# ===============================
+# Uruchomienie z wiersza poleceń
+# ===============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m coa.backtest",
+                                     description="Test wsteczny prognoz ARIMA (rolling origin) dla plików CSV.")
+    parser.add_argument("paths", nargs="+", help="pliki CSV (każda kolumna z cenami osobno)")
+    parser.add_argument("--horizon", type=int, default=1, help="liczba dni prognozy (domyślnie 1)")
+    parser.add_argument("--order", type=int, nargs=3, default=forecast.ORDER, metavar=("P", "D", "Q"),
+                        help="rząd modelu ARIMA (domyślnie 5 1 0)")
+    parser.add_argument("--train", type=int, default=TRAIN, help=f"obserwacje przed pierwszą prognozą (domyślnie {TRAIN})")
+    parser.add_argument("--refit-every", type=int, help="ponowna estymacja parametrów co N punktów (domyślnie raz)")
+    parser.add_argument("--alpha", type=float, default=forecast.ALPHA, help="poziom istotności przedziału (domyślnie 0.05)")
+    parser.add_argument("--workers", type=int, help="liczba procesów (domyślnie liczba rdzeni)")
+    args = parser.parse_args(argv)
+    if not 1 <= args.horizon <= forecast.MAX_HORIZON:
+        parser.error(f"--horizon musi być z zakresu 1-{forecast.MAX_HORIZON}")
+
+    from coa.ingest import read_prices
+    for path in args.paths:
+        _, values, tickers = read_prices(path)
+        for i, ticker in enumerate(tickers):
+            column = values[~np.isnan(values[:, i]), i]
+            start = time.perf_counter()
+            frame = backtest(column, args.horizon, tuple(args.order), args.train, args.refit_every, args.workers)
+            print(f"{os.path.basename(path)} {ticker} ARIMA{tuple(args.order)}: {frame['origin'].nunique()} punktów"
+                  f" startowych, {(time.perf_counter() - start) * 1000:.0f} ms")
+            print(summarize(frame, args.alpha).to_string(index=False, float_format=lambda x: f"{x:.4g}"), end="\n\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+# -------------------
+# Prognozy dla wielu kryptowalut naraz (plik "szeroki", np. Data/crypto_prices.csv)
+# -------------------
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+from coa import forecast
+from coa.cache import forecast_key
+from coa.fast_ar import predict_path_fast
+from coa.ingest import read_prices, time_step
+from coa.order_select import select_order_cached
+from coa.params_store import predict_path_warm
+from coa.metrics import inc
+from coa.timing import TIMINGS, span
+
+
+def _forecast_column(task):
+    # Zadanie dla jednego procesu z puli: jedna kolumna = jeden model ARIMA
+    values, steps, order, ticker, params_dir, method, window = task
+    if method != "mle":
+        return predict_path_fast(values, steps, order, method, window)  # AR(p) w postaci zamkniętej, bez statsmodels
+    if params_dir:
+        return predict_path_warm(values, steps, order, ticker, params_dir, window=window)  # start z zapisanych parametrów
+    return forecast.predict_path(values, steps, order, window=window)
+
+
+def _forecast_column_timed(task):
+    # _forecast_column w procesie z puli: razem z wynikiem odsyłamy czasy etapów (coa.timing) tego zadania
+    TIMINGS.begin()
+    return _forecast_column(task), TIMINGS.take()
+
+
+# ===============================
+# Wszystkie kolumny w puli procesów
+# ===============================
+def forecast_all(dates, values, tickers, steps=1, order=forecast.ORDER, alpha=forecast.ALPHA, workers=None,
+                 cache=None, params_dir=None, orders=None, fast=None, window=None):
+    # values - macierz (n, k) jak z read_prices; workers=None -> liczba rdzeni, workers=1 -> bez puli
+    # cache - opcjonalny coa.cache.ForecastCache; do puli trafiają tylko kolumny, których w nim nie ma
+    # params_dir - katalog coa.params_store: dopasowania startują z zapisanych parametrów danego tickera
+    # orders - opcjonalny słownik ticker -> rząd (np. z select_orders); brak tickera -> order
+    # fast - "ols" / "yw": kolumny z rzędem bez części MA (q = 0) liczone przez coa.fast_ar w tym procesie
+    # window - okno dopasowania jak w forecast.fit_window ("N" albo zakres dat), liczone osobno dla każdej kolumny
+    # Zwraca DataFrame: ticker, step, date, forecast, lower, upper, fallback (jeden wiersz na krok i kolumnę)
+    orders = [tuple((orders or {}).get(ticker, order)) for ticker in tickers]
+    columns = []
+    for i in range(len(tickers)):
+        valid = ~np.isnan(values[:, i])  # kolumny w szerokim pliku mogą mieć luki w różnych miejscach
+        columns.append((dates[valid], values[valid, i]))
+    windows = [forecast.fit_window(window, col_dates) for col_dates, _ in columns]
+    methods = [fast if fast and col_order[2] == 0 else "mle" for col_order in orders]
+
+    keys = [forecast_key(col_values, col_order, steps, method, col_window)
+            for (_, col_values), col_order, method, col_window in zip(columns, orders, methods, windows)]
+    results = [cache.get(key) if cache is not None else None for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    tasks = [(columns[i][1], steps, orders[i], tickers[i], params_dir, methods[i], windows[i]) for i in missing]
+    computed = {i: _forecast_column(task) for i, task in zip(missing, tasks) if task[5] != "mle"}  # ułamki ms - bez puli
+    pooled = [i for i in missing if i not in computed]
+    tasks = [task for task in tasks if task[5] == "mle"]
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks)) or 1
+    if workers == 1:
+        computed.update(zip(pooled, map(_forecast_column, tasks)))
+    else:
+        # spawn - forecast_all bywa wołane z wątku (coa.watch, obok serwera metryk); fork procesu z wątkami
+        # mógłby skopiować zajętą blokadę (np. TIMINGS, METRICS) i zawiesić proces potomny
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+            chunksize = max(1, len(tasks) // (workers * 4))  # kilka paczek na proces - mniej narzutu przy setkach kolumn
+            for i, (result, spans) in zip(pooled, pool.map(_forecast_column_timed, tasks, chunksize=chunksize)):
+                computed[i] = result
+                TIMINGS.merge(spans)
+
+    for i in missing:
+        results[i] = computed[i]
+        inc("fits", method=methods[i])
+        if results[i][1] is None:
+            inc("fallbacks")
+        elif cache is not None:  # ostatniej wartości (fallback) nie zapamiętujemy
+            cache.put(keys[i], results[i])
+    if cache is not None and len(missing) < len(keys):
+        inc("cache_hits", len(keys) - len(missing))
+
+    # ---- tabela wyników ----
+    rows = []
+    for ticker, (col_dates, _), (mean, se) in zip(tickers, columns, results):
+        if se is None:
+            lower = upper = np.full(steps, np.nan)  # model się nie dopasował - zwracamy ostatnią wartość bez przedziału
+        else:
+            lower, upper = forecast.interval(mean, se, alpha)
+        next_dates = col_dates[-1] + np.arange(1, steps + 1) * time_step(col_dates)
+        rows.extend(
+            (ticker, step + 1, next_dates[step], mean[step], lower[step], upper[step], se is None)
+            for step in range(steps))
+    return pd.DataFrame(rows, columns=["ticker", "step", "date", "forecast", "lower", "upper", "fallback"])
+
+
+# ===============================
+# Automatyczny dobór rzędu dla każdej kolumny
+# ===============================
+def select_orders(values, tickers, orders_dir, criterion="aic", workers=None, refresh=False, margin=None):
+    # ticker -> rząd zapisany wcześniej w orders_dir albo dobrany teraz (coa.order_select);
+    # kolumny po kolei - pula procesów liczy kandydatów jednej kolumny
+    # margin - odrzucanie kandydatów po przesiewie (coa.order_select.select_order); None = pełne przeszukanie
+    return {ticker: select_order_cached(values[~np.isnan(values[:, i]), i], ticker, orders_dir, refresh, criterion,
+                                        workers=workers, margin=margin)
+            for i, ticker in enumerate(tickers)}
+
+
+def forecast_file(file_path, steps=1, order=forecast.ORDER, alpha=forecast.ALPHA, workers=None, cache=None,
+                  params_dir=None, orders_dir=None, criterion="aic", fast=None, window=None, datasets=None,
+                  margin=None):
+    # plik jest wczytywany raz, a kolumny dzielone między procesy
+    # datasets - opcjonalny coa.dataset_cache.DatasetCache (kopia binarna pliku zamiast parsowania CSV)
+    # orders_dir - katalog zapisanych rzędów: rząd każdej kolumny dobierany automatycznie zamiast order
+    with span("load"):
+        dates, values, tickers = (datasets.read_prices if datasets is not None else read_prices)(file_path)
+    orders = select_orders(values, tickers, orders_dir, criterion, workers, margin=margin) if orders_dir else None
+    return forecast_all(dates, values, tickers, steps, order, alpha, workers, cache, params_dir, orders, fast, window)
@@ -0,0 +1,123 @@
+# -------------------
+# Pamięć podręczna prognoz: klucz = skrót wartości szeregu + rząd modelu + horyzont
+# -------------------
+# Dwa poziomy: LRU w pamięci (natychmiast) i opcjonalnie pliki .npz na dysku (przetrwają restart programu).
+# Na dysku trzymamy najwyżej max_files plików - po zapisie usuwamy najdawniej używane (mtime, odświeżany przy odczycie).
+# Jeden obiekt może być używany z wielu wątków (coa.service) - LRU i liczniki chroni blokada.
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def default_cache_dir():
+    # katalog na pliki pamięci podręcznej (można zmienić zmienną środowiskową COA_CACHE_DIR)
+    return os.environ.get("COA_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "crypto-oracle-analytics")
+
+
+def forecast_key(values, order, steps, method="mle", window=None):
+    # skrót bajtów float64 szeregu + parametrów - ten sam szereg daje ten sam klucz niezależnie od źródła
+    # method - estymator ("mle" = statsmodels, inne np. z coa.fast_ar); window - okno dopasowania (start, stop)
+    # klucze "mle" na całym szeregu bez zmian względem starszych wersji
+    params = (tuple(order), int(steps))
+    if method != "mle":
+        params += (method,)
+    if window is not None:
+        params += (tuple(int(i) for i in window),)
+    h = hashlib.blake2b(digest_size=20)
+    h.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    h.update(repr(params).encode())
+    return h.hexdigest()
+
+
+class ForecastCache:
+    # Przechowuje wyniki predict_path: (prognozy, błędy standardowe)
+
+    def __init__(self, max_items=128, directory=None, max_files=2000):
+        self.max_items = max_items
+        self.max_files = max_files      # limit plików .npz na dysku (prognoza to ok. 1 kB)
+        self.directory = directory      # None = tylko pamięć
+        self._items = OrderedDict()     # klucz -> (prognozy, błędy), kolejność = ostatnie użycie
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()   # odczyt pliku i zapis na dysk są poza blokadą
+        if directory:
+            try:
+                os.makedirs(directory, exist_ok=True)
+            except OSError:
+                self.directory = None  # brak uprawnień do katalogu - działamy tylko w pamięci
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)  # ostatnio używany
+                self.hits += 1
+                return value
+
+        value = self._load(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+        if self.directory:
+            mean, se = value
+            path = self._path(key)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"  # osobny plik dla każdego wątku
+            try:
+                np.savez(tmp, mean=mean, se=se)  # zapis do pliku tymczasowego i zamiana - bez połowicznych plików
+                os.replace(tmp, path)
+            except OSError as e:
+                print("Błąd zapisu pamięci podręcznej:", e)
+                return
+            self._prune()
+
+    def _remember(self, key, value):
+        # wywoływane z zajętą blokadą
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)  # usuwamy najdawniej używany
+
+    # ===============================
+    # Poziom dyskowy
+    # ===============================
+    def _path(self, key):
+        return os.path.join(self.directory, f"forecast_{key}.npz")
+
+    def _load(self, key):
+        if not self.directory or not os.path.exists(self._path(key)):
+            return None
+        try:
+            with np.load(self._path(key)) as data:
+                value = data["mean"], data["se"]
+            os.utime(self._path(key))  # ostatnie użycie - _prune usuwa najdawniej używane pliki
+            return value
+        except (OSError, ValueError, KeyError):
+            return None  # uszkodzony plik traktujemy jak brak wpisu
+
+    def _prune(self):
+        # usuwa najdawniej używane pliki ponad max_files (np. prognozy w tle przy obserwowaniu folderu)
+        try:
+            with os.scandir(self.directory) as entries:
+                files = [(entry.stat().st_mtime_ns, entry.path) for entry in entries
+                         if entry.name.startswith("forecast_") and entry.name.endswith(".npz") and ".tmp" not in entry.name]
+        except OSError:
+            return
+        if len(files) <= self.max_files:
+            return
+        files.sort()
+        for _, path in files[:len(files) - self.max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # usunięty w międzyczasie (np. przez inny proces)
@@ -0,0 +1,113 @@
+# -------------------
+# Binarna kopia sparsowanych plików CSV (.npy) - ponowne otwarcie pliku bez parsowania tekstu
+# -------------------
+# Dla każdego pliku źródłowego osobny katalog: dates.npy, values.npy i meta.json (tickery, rozmiar, mtime,
+# skrót BLAKE2b źródła). Kopia jest ważna, gdy zgadza się rozmiar i mtime; jeśli zmienił się tylko mtime
+# (np. plik skopiowany albo "dotknięty"), decyduje skrót zawartości. Tablice otwieramy przez np.load(mmap_mode="r"),
+# więc wczytanie dużego pliku nie kopiuje danych, dopóki nie są potrzebne.
+
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+from coa.metrics import inc
+
+VERSION = 1   # zmiana formatu kopii -> stare kopie są ignorowane
+
+
+def file_hash(path, chunk=1 << 20):
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class DatasetCache:
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = self.misses = 0
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError:
+            self.directory = None  # brak uprawnień do katalogu - zawsze parsujemy CSV
+
+    def _entry(self, path):
+        # katalog kopii: skrót ścieżki bezwzględnej (różne pliki o tej samej nazwie się nie mieszają)
+        name = hashlib.blake2b(os.path.abspath(path).encode(), digest_size=10).hexdigest()
+        return os.path.join(self.directory, name)
+
+    # ===============================
+    # Odczyt kopii (albo None, gdy jej nie ma lub jest nieaktualna)
+    # ===============================
+    def get(self, path):
+        if self.directory is None:
+            return None
+        entry = self._entry(path)
+        try:
+            stat = os.stat(path)
+            with open(os.path.join(entry, "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != VERSION or meta["size"] != stat.st_size:
+                return None
+            if meta["mtime_ns"] != stat.st_mtime_ns:
+                if meta["hash"] != file_hash(path):
+                    return None
+                meta["mtime_ns"] = stat.st_mtime_ns  # ta sama zawartość - następnym razem wystarczy mtime
+                self._write_meta(entry, meta)
+            dates = np.load(os.path.join(entry, "dates.npy"), mmap_mode="r")
+            values = np.load(os.path.join(entry, "values.npy"), mmap_mode="r")
+        except (OSError, ValueError, KeyError):
+            return None
+        if values.shape != (dates.shape[0], len(meta["tickers"])):
+            return None
+        return dates, values, list(meta["tickers"])
+
+    # ===============================
+    # Zapis kopii po sparsowaniu CSV
+    # ===============================
+    def put(self, path, dates, values, tickers):
+        if self.directory is None:
+            return
+        entry = self._entry(path)
+        try:
+            stat = os.stat(path)
+            digest = file_hash(path)
+            os.makedirs(entry, exist_ok=True)
+            for name, array in (("dates", dates), ("values", values)):
+                tmp = os.path.join(entry, f"{name}.{os.getpid()}.{threading.get_ident()}.tmp.npy")
+                np.save(tmp, np.ascontiguousarray(array))
+                os.replace(tmp, os.path.join(entry, f"{name}.npy"))
+            self._write_meta(entry, {
+                "version": VERSION,
+                "source": os.path.abspath(path),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "hash": digest,
+                "tickers": [str(t) for t in tickers],
+            })  # meta.json na końcu - bez niego kopia nie jest używana
+        except OSError as e:
+            print("Błąd zapisu kopii binarnej:", e)
+
+    @staticmethod
+    def _write_meta(entry, meta):
+        tmp = os.path.join(entry, f"meta.{os.getpid()}.{threading.get_ident()}.tmp")  # także wątek GUI i wątek w tle
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp, os.path.join(entry, "meta.json"))
+
+    def read_prices(self, path):
+        # jak coa.ingest.read_prices, ale z kopii binarnej, jeśli jest aktualna
+        cached = self.get(path)
+        if cached is not None:
+            self.hits += 1
+            inc("loads", source="binary")
+            return cached
+        self.misses += 1
+        from coa.ingest import read_prices
+        dates, values, tickers = read_prices(path)
+        self.put(path, dates, values, tickers)
+        return dates, values, tickers
@@ -0,0 +1,43 @@
+# -------------------
+# Zmniejszanie liczby punktów do narysowania bez zmiany wyglądu wykresu
+# -------------------
+# Wykres o szerokości ~700 pikseli nie pokaże więcej szczegółów niż ~700 punktów,
+# więc przy dużych oknach rysujemy tylko wybrane punkty (koszt rysowania nie rośnie z długością okna).
+
+import numpy as np
+
+
+def _buckets(n, n_out):
+    # granice n_out - 2 kubełków dla punktów 1 ... n-2 (pierwszy i ostatni punkt zawsze zostają)
+    return np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+
+
+# ===============================
+# Largest-Triangle-Three-Buckets
+# ===============================
+def lttb(x, y, n_out):
+    # Zwraca indeksy n_out punktów: z każdego kubełka wybieramy punkt tworzący największy trójkąt
+    # z punktem wybranym w poprzednim kubełku i średnią następnego kubełka.
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = _buckets(n, n_out)
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts  # średnie wszystkich kubełków naraz
+    mean_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    mean_x = np.append(mean_x, x[-1])  # "następny kubełek" dla ostatniego kubełka to ostatni punkt
+    mean_y = np.append(mean_y, y[-1])
+
+    idx = np.empty(n_out, dtype=np.intp)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        xs, ys = x[start:end], y[start:end]
+        # podwojone pole trójkąta (punkt a, kandydat, średnia następnego kubełka)
+        area = np.abs((x[a] - mean_x[i + 1]) * (ys - y[a]) - (x[a] - xs) * (mean_y[i + 1] - y[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
@@ -0,0 +1,91 @@
+# -------------------
+# Szybka ścieżka dla ARIMA(p, d, 0): AR(p) na różnicach szeregu, estymacja w postaci zamkniętej (NumPy)
+# -------------------
+# ARIMA(5,1,0) to AR(5) na pierwszych różnicach - zamiast MLE w modelu stanowym (statsmodels) wystarczy
+# regresja na opóźnieniach (OLS) albo równania Yule'a-Walkera. Przedział prognozy liczymy analitycznie
+# z wag psi modelu phi(B)(1-B)^d. Wynik jest bliski statsmodels (estymator warunkowy zamiast dokładnego MLE).
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from coa.forecast import MIN_OBS, ORDER
+from coa.timing import span
+
+METHODS = ("ols", "yw")
+
+
+def fit_ar(x, p, intercept=False, method="ols"):
+    # AR(p) dla szeregu x: zwraca (stała, współczynniki phi_1..phi_p, wariancja szumu)
+    x = np.asarray(x, dtype=np.float64)
+    if method == "ols":
+        y = x[p:]
+        columns = [sliding_window_view(x[:-1], p)[:, ::-1]] if p else []  # wiersz t: x[t-1], ..., x[t-p]
+        if intercept:
+            columns.insert(0, np.ones((len(y), 1)))
+        X = np.hstack(columns) if columns else np.empty((len(y), 0))
+        coef = np.linalg.lstsq(X, y, rcond=None)[0]
+        resid = y - X @ coef
+        const, phi = (coef[0], coef[1:]) if intercept else (0.0, coef)
+        return float(const), phi, float(resid @ resid / len(y))
+    if method == "yw":
+        mean = x.mean() if intercept else 0.0
+        xc = x - mean
+        acov = np.array([xc[k:] @ xc[:len(xc) - k] for k in range(p + 1)]) / len(xc)  # autokowariancje 0..p
+        toeplitz = acov[np.abs(np.subtract.outer(np.arange(p), np.arange(p)))]
+        phi = np.linalg.solve(toeplitz, acov[1:]) if p else np.empty(0)
+        return float(mean * (1 - phi.sum())), phi, float(acov[0] - phi @ acov[1:])
+    raise ValueError(f"Nieznana metoda: {method}")
+
+
+def psi_weights(phi, d, steps):
+    # wagi psi_0..psi_{steps-1} reprezentacji MA(inf) modelu phi(B)(1-B)^d y_t = e_t
+    poly = np.concatenate(([1.0], -np.asarray(phi, dtype=np.float64)))
+    for _ in range(d):
+        poly = np.convolve(poly, [1.0, -1.0])
+    psi = np.zeros(steps)
+    psi[0] = 1.0
+    for j in range(1, steps):
+        k = min(j, len(poly) - 1)
+        psi[j] = -poly[1:k + 1] @ psi[j - 1::-1][:k]
+    return psi
+
+
+# ===============================
+# Prognoza na kilka kroków (odpowiednik forecast.predict_path)
+# ===============================
+def predict_path_fast(values, steps=1, order=ORDER, method="ols", window=None):
+    # Zwraca (prognozy, błędy standardowe) albo (ostatnia wartość powtórzona, None) - jak forecast.predict_path.
+    # Tylko rzędy bez części MA (q = 0). Stała w modelu tylko dla d = 0 (jak domyślny trend statsmodels ARIMA).
+    # window - (start, stop): estymacja tylko na values[start:stop], prognoza od końca values
+    p, d, q = order
+    if q:
+        raise ValueError("Szybka ścieżka obsługuje tylko modele ARIMA(p, d, 0)")
+    values = np.asarray(values, dtype=np.float64)
+    last = float(values[-1])
+    start, stop = window or (0, len(values))
+    if stop - start < max(MIN_OBS, p + d + 2):
+        return np.full(steps, last), None
+
+    try:
+        with span("fit"):
+            const, phi, sigma2 = fit_ar(np.diff(values[start:stop], n=d), p, intercept=(d == 0), method=method)
+
+        # ---- prognoza różnic rekurencją AR, potem d-krotne całkowanie do poziomu cen ----
+        with span("forecast"):
+            x = np.diff(values, n=d)
+            path = np.concatenate((x[len(x) - p:], np.empty(steps)))
+            for h in range(steps):
+                path[p + h] = const + phi @ path[h:p + h][::-1]
+            mean = path[p:]
+            for k in reversed(range(d)):
+                mean = np.diff(values, n=k)[-1] + np.cumsum(mean)
+
+        with span("conf_int"):
+            se = np.sqrt(sigma2 * np.cumsum(psi_weights(phi, d, steps) ** 2))
+        if not (np.all(np.isfinite(mean)) and np.all(np.isfinite(se))):
+            raise ValueError("niestabilne oszacowanie")
+        return mean, se
+
+    except Exception as e:
+        print("Błąd AR:", e)
+        return np.full(steps, last), None
@@ -0,0 +1,144 @@
+# -------------------
+# Model ARIMA - logika predykcji niezależna od GUI
+# -------------------
+
+from statistics import NormalDist
+
+import numpy as np
+
+from coa.timing import span
+
+ORDER = (5, 1, 0)   # domyślne parametry modelu (p, d, q)
+MIN_OBS = 20        # minimalna liczba obserwacji potrzebna do modelu ARIMA
+ALPHA = 0.05        # przedział ufności 95%
+MAX_HORIZON = 90    # maksymalna liczba kroków prognozy
+FAN_ALPHAS = (0.05, 0.2, 0.5)  # pasma wykresu wachlarzowego: 95%, 80%, 50%
+
+_state = None       # (order, wartości, wyniki) ostatniego dopasowania w tym procesie
+
+
+# ===============================
+# Dopasowanie modelu
+# ===============================
+def fit_arima(values, order=ORDER, progress=None, start_params=None, maxiter=None):
+    # progress(n) - opcjonalna funkcja wywoływana na starcie (n = 0) i po każdej iteracji optymalizatora
+    # start_params - parametry startowe optymalizatora (np. z poprzedniego dopasowania); None = domyślne statsmodels
+    # maxiter - limit iteracji optymalizatora (np. szybki przesiew w coa.order_select); None = domyślny statsmodels
+    method_kwargs = {} if maxiter is None else {"maxiter": maxiter}
+    if progress is not None:
+        iteration = [0]
+
+        def callback(params):
+            iteration[0] += 1
+            progress(iteration[0])
+        method_kwargs["callback"] = callback
+        progress(0)  # sygnał, że zaczyna się pełne dopasowanie (start "na ciepło" może nie potrzebować iteracji)
+
+    import pandas as pd
+    from statsmodels.tsa.arima.model import ARIMA  # import przy pierwszym dopasowaniu (~2 s) - nie spowalnia startu programu
+
+    model = ARIMA(pd.Series(values), order=order)  # pandas Series (wymagane przez ARIMA)
+    if start_params is not None:
+        try:
+            return model.fit(start_params=start_params, method_kwargs=dict(method_kwargs))
+        except Exception as e:
+            print("Błąd dopasowania z parametrami startowymi, start domyślny:", e)
+    return model.fit(method_kwargs=method_kwargs)
+
+
+# ===============================
+# Aktualizacja zapamiętanego modelu zamiast ponownego dopasowania
+# ===============================
+def update_or_fit(values, order=ORDER, refit=False, progress=None, start_params=None):
+    # Jeśli values to poprzedni szereg + nowe punkty na końcu, nowe obserwacje dokładamy filtrem Kalmana
+    # (results.extend) przy niezmienionych parametrach - bez ponownej estymacji MLE.
+    # Zwraca (wyniki modelu, czy_było_pełne_dopasowanie).
+    global _state
+    order = tuple(order)
+    if not refit and _state is not None:
+        old_order, old_values, results = _state
+        n = len(old_values)
+        if old_order == order and len(values) >= n and np.array_equal(values[:n], old_values):
+            if len(values) > n:
+                results = results.extend(np.asarray(values[n:]))  # filtr tylko po nowych obserwacjach
+            _state = (order, np.array(values, dtype=np.float64), results)
+            return results, False
+
+    results = fit_arima(values, order, progress, start_params)
+    _state = (order, np.array(values, dtype=np.float64), results)
+    return results, True
+
+
+def current_params():
+    # parametry zapamiętanego modelu (po dopasowaniu lub aktualizacji) albo None
+    return None if _state is None else np.asarray(_state[2].params, dtype=np.float64)
+
+
+def reset_state():
+    global _state
+    _state = None
+
+
+# ===============================
+# Okno dopasowania (ostatnie N obserwacji albo zakres dat)
+# ===============================
+def fit_window(spec, dates):
+    # spec: "" / None - cały szereg; "N" - ostatnie N obserwacji; "dd.mm.yyyy" - od daty do końca;
+    # "dd.mm.yyyy-dd.mm.yyyy" - zakres dat (włącznie). Zwraca (start, stop) - indeksy w dates - albo None.
+    # Błędny tekst -> ValueError
+    spec = (spec or "").strip()
+    if not spec:
+        return None
+    n = len(dates)
+    if spec.isdigit():
+        return max(n - int(spec), 0), n
+
+    from datetime import datetime
+    from coa.ingest import DATE_FORMAT
+    bounds = [np.datetime64(datetime.strptime(part.strip(), DATE_FORMAT), "s") for part in spec.split("-", 1)]
+    dates = np.asarray(dates, dtype="datetime64[s]")
+    start = int(np.searchsorted(dates, bounds[0], side="left"))
+    stop = int(np.searchsorted(dates, bounds[1], side="right")) if len(bounds) > 1 else n
+    return start, stop
+
+
+# ===============================
+# Przedział ufności z błędu standardowego prognozy
+# ===============================
+def interval(mean, se, alpha=ALPHA):
+    # to samo co forecast.conf_int(alpha): prognoza ± z(1 - alpha/2) * błąd standardowy
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    return mean - z * se, mean + z * se
+
+
+# ===============================
+# Prognoza na kilka kroków z jednego dopasowania
+# ===============================
+def predict_path(values, steps=1, order=ORDER, progress=None, refit=True, start_params=None, window=None):
+    # Zwraca (prognozy, błędy standardowe) - tablice długości steps - albo (ostatnia wartość powtórzona, None),
+    # gdy modelu nie da się dopasować. Przedziały dla dowolnego poziomu daje interval(prognozy, błędy, alpha).
+    # window - (start, stop) z fit_window: parametry estymowane tylko na values[start:stop] (koszt dopasowania
+    # nie rośnie z historią); obserwacje po stop dokłada filtr Kalmana, więc prognoza zawsze startuje z końca values
+    last = float(values[-1])
+    start, stop = window or (0, len(values))
+    if stop - start < MIN_OBS:
+        return np.full(steps, last), None  # jeśli za mało danych, zwracamy ostatnią wartość
+
+    try:
+        with span("fit"):
+            model_fit, _ = update_or_fit(values[start:stop], order, refit, progress, start_params)
+            if stop < len(values):
+                model_fit = model_fit.extend(np.asarray(values[stop:]))
+
+        with span("forecast"):
+            forecast = model_fit.get_forecast(steps=steps)  # cała ścieżka prognozy (t+1 ... t+steps)
+            mean = np.asarray(forecast.predicted_mean, dtype=np.float64)
+        with span("conf_int"):
+            se = np.asarray(forecast.se_mean, dtype=np.float64)  # podstawa przedziałów ufności (interval)
+        return mean, se
+
+    except Exception as e:
+        # jeśli coś pójdzie nie tak (np. brak danych, problem z dopasowaniem), zwracamy ostatnią wartość
+        print("Błąd ARIMA:", e)
+        reset_state()
+        return np.full(steps, last), None
@@ -0,0 +1,143 @@
+# -------------------
+# Wczytywanie plików CSV z cenami (format: "Ticker;XXX-USD", daty dd.mm.yyyy albo dd.mm.yyyy HH:MM)
+# -------------------
+
+import io
+
+import numpy as np
+import pandas as pd
+
+from coa.metrics import inc
+
+DATE_FORMAT = "%d.%m.%Y"           # format dat w plikach z katalogu Data/ (dane dzienne)
+DATETIME_FORMAT = "%d.%m.%Y %H:%M"  # dane godzinowe i minutowe (np. z coa.synthetic)
+SEP = ";"
+
+
+def to_float(column):
+    # Kolumna liczbowa -> float64. Parser C zwraca tekst (object), jeśli choć jeden wiersz ma przecinek
+    # dziesiętny (np. "66191,00" w BTC_prices.csv obok "18364.12109") - wtedy zamieniamy przecinki
+    # wektorowo na całej kolumnie (kolumny rozdziela ';', więc przecinek nie może oznaczać niczego innego)
+    if column.dtype == object or pd.api.types.is_string_dtype(column):
+        column = column.astype(str).str.replace(",", ".", regex=False)
+    return pd.to_numeric(column, errors="coerce")
+
+
+# ===============================
+# Wczytanie całego pliku (wszystkie kolumny z cenami)
+# ===============================
+def read_prices(file_path):
+    # Zwraca (daty, wartości, tickery):
+    #   daty     - datetime64[s], shape (n,)
+    #   wartości - float64, shape (n, k) - jedna kolumna na kryptowalutę
+    #   tickery  - nazwy kolumn z nagłówka, np. ["BTC-USD"]
+    df = pd.read_csv(
+        file_path,
+        sep=SEP,
+        dtype={0: str},   # kolumna dat jako tekst - parsujemy ją niżej jednym wywołaniem
+        encoding="utf-8-sig")
+    inc("loads", source="csv")
+    return _parse_frame(df)
+
+
+def _parse_frame(df):
+    # DataFrame z read_csv (pierwsza kolumna - daty jako tekst) -> (daty, wartości, tickery)
+    time_col = df.columns[0]
+    tickers = list(df.columns[1:])
+
+    # ---- daty: jedno wektorowe parsowanie z jawnym formatem (zamiast strptime dla każdego punktu) ----
+    # format rozpoznajemy po pierwszej dacie w pliku: sama data albo data z godziną
+    first = df[time_col].first_valid_index()
+    date_format = DATETIME_FORMAT if first is not None and len(df[time_col][first].strip()) > 10 else DATE_FORMAT
+    dates = pd.to_datetime(df[time_col], format=date_format, errors="coerce").to_numpy(dtype="datetime64[s]")
+
+    # ---- wartości: float64 (float32 gubi cyfry przy cenach BTC) ----
+    values = df[tickers].apply(to_float).to_numpy(dtype=np.float64)
+    return dates, values, tickers
+
+
+def date_format(dates):
+    # format do wyświetlania i zapisu dat: dd.mm.yyyy, jeśli wszystkie są o północy (dane dzienne)
+    seconds = np.asarray(dates, dtype="datetime64[s]")
+    seconds = seconds[~np.isnat(seconds)].astype(np.int64)
+    return DATE_FORMAT if np.all(seconds % 86400 == 0) else DATETIME_FORMAT
+
+
+def time_step(dates, last=50):
+    # odstęp między kolejnymi punktami szeregu (mediana z ostatnich `last` różnic) - daty kolejnych prognoz;
+    # za mało danych -> jeden dzień
+    seconds = np.asarray(dates, dtype="datetime64[s]")[-last - 1:]
+    diffs = np.diff(seconds[~np.isnat(seconds)].astype(np.int64))
+    diffs = diffs[diffs > 0]
+    return np.timedelta64(int(np.median(diffs)), "s") if len(diffs) else np.timedelta64(1, "D")
+
+
+# ===============================
+# Wczytanie jednej kolumny (jak w GUI)
+# ===============================
+def read_series(file_path, column=0, cache=None):
+    # column - indeks kolumny z cenami (0 = pierwsza po kolumnie dat) albo nazwa tickera
+    # cache - opcjonalny coa.dataset_cache.DatasetCache (kopia binarna zamiast parsowania CSV)
+    dates, values, tickers = (cache.read_prices if cache is not None else read_prices)(file_path)
+    if not isinstance(column, int):
+        column = tickers.index(column)
+    return dates, values[:, column], tickers[column]
+
+
+# ===============================
+# Wiersze dopisane na końcu pliku (pliki rosnące o jedną linię dziennie)
+# ===============================
+class FileTail:
+    # Pamięta, do którego bajtu plik był wczytany i jaka była ostatnia data. read_new() parsuje tylko to,
+    # co dopisano później. Plik nadpisany albo skrócony (inne bajty przed zapamiętanym miejscem) -> None,
+    # czyli trzeba wczytać całość.
+    SIGNATURE = 256   # ile bajtów przed zapamiętanym miejscem musi się zgadzać
+    CHUNK = 1 << 16   # przy starcie czytamy tylko nagłówek i koniec pliku (bez ponownego czytania całości)
+
+    def __init__(self, file_path, dates):
+        # dates - daty z pełnego odczytu tego pliku (read_prices / read_series)
+        self.path = file_path
+        valid = np.asarray(dates, dtype="datetime64[s]")
+        valid = valid[~np.isnat(valid)]
+        self.last_date = valid.max() if len(valid) else np.datetime64("NaT", "s")
+        self.signature = b""
+        with open(file_path, "rb") as f:
+            self.tickers = f.readline().decode("utf-8-sig").strip().split(SEP)[1:]
+            base = max(f.seek(0, io.SEEK_END) - self.CHUNK, 0)
+            f.seek(base)
+            self._remember(f.read(), base)
+
+    def _remember(self, data, base=0):
+        # zapamiętuje miejsce za ostatnim pełnym wierszem z data (bajty pliku od pozycji base)
+        # niepełny ostatni wiersz (np. plik bez "\n" na końcu albo zapis w toku) zostanie przeczytany ponownie
+        self.offset = base + data.rfind(b"\n") + 1
+        start = max(self.offset - self.SIGNATURE, 0)
+        self.signature = (data[start - base:self.offset - base] if start >= base
+                          else self.signature[len(self.signature) - (base - start):] + data[:self.offset - base])
+
+    def read_new(self):
+        # Zwraca (daty, wartości (m, k)) pełnych wierszy (zakończonych "\n") z datą późniejszą niż ostatnia wczytana
+        # albo None, jeśli plik zmienił się inaczej niż przez dopisanie na końcu
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self.offset - len(self.signature))
+                if f.read(len(self.signature)) != self.signature:
+                    return None
+                data = f.read()
+        except OSError:
+            return None
+
+        data = data[:data.rfind(b"\n") + 1]  # niepełny ostatni wiersz poczeka na kolejny odczyt
+        if not data.strip():
+            return np.empty(0, dtype="datetime64[s]"), np.empty((0, len(self.tickers)))
+        df = pd.read_csv(io.BytesIO(data), sep=SEP, header=None, names=["Ticker", *self.tickers], dtype={0: str})
+        dates, values, _ = _parse_frame(df)
+        self._remember(data, self.offset)
+
+        keep = ~np.isnat(dates)
+        if not np.isnat(self.last_date):
+            keep &= dates > self.last_date  # np. ostatni wiersz pliku bez "\n", wczytany już przy pełnym odczycie
+        dates, values = dates[keep], values[keep]
+        if len(dates):
+            self.last_date = dates.max()
+        return dates, values
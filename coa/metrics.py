@@ -0,0 +1,119 @@
+# -------------------
+# Metryki w formacie tekstowym Prometheusa (tryb bez GUI): liczniki + histogramy czasów etapów z coa.timing
+# -------------------
+# Liczniki zwiększamy w procesie, który zleca pracę (coa.batch, coa.watch, CLI) - wynik z puli procesów
+# i tak tam wraca (prognoza albo ostatnia wartość = fallback), więc nic nie ginie w procesach potomnych.
+# Udostępnienie: plik (np. katalog textfile collectora node_exportera, zapis atomowy) albo lokalny port HTTP
+# (GET /metrics, serwer w wątku w tle). Tylko biblioteka standardowa.
+
+import os
+import threading
+
+from coa.timing import BUCKETS_MS, TIMINGS
+
+PREFIX = "coa"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+HOST = "127.0.0.1"   # domyślnie tylko lokalnie
+
+COUNTERS = {   # nazwa -> opis (HELP)
+    "loads": "Wczytane pliki z cenami (source: csv - parsowanie, binary - kopia .npy)",
+    "fits": "Prognozy policzone modelem (method: mle - statsmodels, ols/yw - coa.fast_ar)",
+    "cache_hits": "Prognozy wzięte z pamięci podręcznej (bez dopasowania)",
+    "fallbacks": "Prognozy zastąpione ostatnią wartością (model się nie dopasował albo za mało danych)",
+    "exports": "Zapisane wyniki (format: csv, json, png, ...)",
+    "errors": "Błędy odczytu plików i prognoz (where: load, forecast, pool)",
+    "requests": "Żądania usługi coa.service (endpoint, status)",
+    "coalesced": "Żądania coa.service, które czekały na wynik identycznego żądania w toku",
+}
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+
+class Metrics:
+    def __init__(self, timings=TIMINGS):
+        self.timings = timings
+        self.counters = {}   # (nazwa, ((etykieta, wartość), ...)) -> liczba
+        self._lock = threading.Lock()
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def value(self, name, **labels):
+        with self._lock:
+            return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    # ===============================
+    # Tekst w formacie Prometheusa
+    # ===============================
+    def render(self):
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+        for name in sorted({key[0] for key, _ in counters}):
+            metric = f"{PREFIX}_{name}_total"
+            lines.append(f"# HELP {metric} {COUNTERS.get(name, name)}")
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(f"{metric}{_labels(dict(labels))} {value}"
+                         for (counter, labels), value in counters if counter == name)
+
+        # ---- czasy etapów: histogram skumulowany (le w sekundach) z rejestru coa.timing ----
+        metric = f"{PREFIX}_stage_duration_seconds"
+        snapshot = self.timings.snapshot()
+        if snapshot:
+            lines.append(f"# HELP {metric} Czas etapów (load, extract, fit, forecast, conf_int, render, export)")
+            lines.append(f"# TYPE {metric} histogram")
+        for stage, (buckets, count, total) in snapshot.items():
+            cumulative = 0
+            for upper, n in zip(BUCKETS_MS, buckets):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{stage="{stage}",le="{upper / 1000:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{stage="{stage}",le="+Inf"}} {count}')
+            lines.append(f'{metric}_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'{metric}_count{{stage="{stage}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        # zapis atomowy (tmp + os.replace) - czytelnik nie zobaczy połowy pliku
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    # ===============================
+    # Lokalny serwer HTTP: GET /metrics
+    # ===============================
+    def serve(self, port, host=HOST):
+        # serwer w wątku w tle (daemon); zwraca obiekt serwera - shutdown() go zatrzymuje
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # bez wpisu na stderr przy każdym odpytaniu
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+METRICS = Metrics()   # rejestr tego procesu
+inc = METRICS.inc
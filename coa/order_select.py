@@ -0,0 +1,151 @@
+# -------------------
+# Automatyczny dobór rzędu (p, d, q) modelu ARIMA (zamiast pmdarima.auto_arima)
+# -------------------
+# Siatka kandydatów oceniana kryterium informacyjnym (AIC lub BIC) w puli procesów. Domyślnie każdy kandydat
+# jest dopasowany w pełni. Z margin wyszukiwanie ma dwa etapy:
+#   1. przesiew - każdy kandydat dopasowany z kilkoma iteracjami optymalizatora (tanio),
+#   2. pełne dopasowanie niezbieżnych kandydatów gorszych od najlepszego o najwyżej margin punktów kryterium,
+#      startując z parametrów z przesiewu (optymalizator nie powtarza pierwszych iteracji).
+# Wynik przesiewu nie ogranicza wyniku końcowego: kandydat odrzucony po przesiewie mógłby po pełnym dopasowaniu
+# wygrać (ETH: (3,1,2) po przesiewie 25 punktów za najlepszym, a ostatecznie najlepszy), więc z margin wybrany
+# rząd może nie być najlepszy w siatce. Bez odrzucania przesiew nic nie oszczędza, dlatego go wtedy pomijamy.
+# Wybrany rząd zapisujemy per aktywo (OrderStore) - kolejne predykcje używają go bez ponownego przeszukiwania.
+
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+
+from coa import forecast
+from coa.params_store import safe_name, write_json
+
+CRITERIA = ("aic", "bic")
+P_VALUES = range(0, 6)
+D_VALUES = (1,)        # ceny są niestacjonarne; kryteria dla różnych d nie są w pełni porównywalne
+Q_VALUES = range(0, 3)
+SCREEN_ITER = 5        # iteracje optymalizatora w przesiewie
+
+
+def candidate_orders(p_values=P_VALUES, d_values=D_VALUES, q_values=Q_VALUES):
+    return [(p, d, q) for d in d_values for p in p_values for q in q_values]
+
+
+def _score(task):
+    # Zadanie dla jednego procesu z puli: (wartość kryterium, czy optymalizator zbiegł, parametry);
+    # inf = nieudane dopasowanie
+    values, order, criterion, maxiter, start_params = task
+    import warnings
+    import statsmodels.tsa.arima.model  # noqa: F401 - statsmodels przy imporcie włącza "always" dla swoich ostrzeżeń
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # brak zbieżności po kilku iteracjach przesiewu jest spodziewany
+            results = forecast.fit_arima(values, order, start_params=start_params, maxiter=maxiter)
+        score = float(getattr(results, criterion))
+        converged = bool(results.mle_retvals.get("converged", False))
+    except Exception:
+        return math.inf, False, None
+    return (score, converged, list(results.params)) if math.isfinite(score) else (math.inf, False, None)
+
+
+# ===============================
+# Przeszukiwanie siatki
+# ===============================
+def select_order(values, orders=None, criterion="aic", workers=None, screen_iter=SCREEN_ITER, margin=None,
+                 executor=None):
+    # Zwraca (najlepszy rząd albo None, słownik rząd -> (kryterium po przesiewie, kryterium końcowe albo None))
+    # workers=None -> liczba rdzeni, workers=1 -> bez puli
+    # executor - istniejąca pula procesów (np. GUI, które zamyka ją przy wyjściu); wtedy workers nie ma znaczenia
+    # margin=None -> bez przesiewu, pełne dopasowanie każdego kandydata (dokładny wynik)
+    if criterion not in CRITERIA:
+        raise ValueError(f"Nieznane kryterium: {criterion}")
+    orders = [tuple(order) for order in (orders or candidate_orders())]
+    if len(values) < forecast.MIN_OBS:
+        return None, {}
+
+    workers = min(workers or os.cpu_count() or 1, len(orders))
+    pool = None
+    if executor is None and workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+    executor = executor or pool
+    run = executor.map if executor is not None else map  # spawn - pulę można też uruchomić z wątku GUI
+    try:
+        # ---- etap 1: przesiew (bez margin od razu pełne dopasowanie) ----
+        maxiter = screen_iter if margin is not None else None
+        screened = list(run(_score, [(values, order, criterion, maxiter, None) for order in orders]))
+        best = min(score for score, _, _ in screened)
+        if not math.isfinite(best):
+            return None, {order: (score, None) for order, (score, _, _) in zip(orders, screened)}
+
+        # ---- etap 2: pełne dopasowanie niezbieżnych kandydatów od parametrów z przesiewu ----
+        final = {order: score for order, (score, converged, _) in zip(orders, screened)
+                 if converged or maxiter is None}
+        survivors = [(order, params) for order, (score, converged, params) in zip(orders, screened)
+                     if order not in final and score <= best + margin]
+        final.update(zip((order for order, _ in survivors), (score for score, _, _ in run(
+            _score, [(values, order, criterion, None, params) for order, params in survivors]))))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    scores = {order: (screen, final.get(order)) for order, (screen, _, _) in zip(orders, screened)}
+    chosen = min(final, key=final.get)
+    return (chosen if math.isfinite(final[chosen]) else None), scores
+
+
+# ===============================
+# Wybrany rząd per aktywo
+# ===============================
+class OrderStore:
+    # Jeden plik JSON na aktywo, zapisywany atomowo (coa.params_store.write_json)
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, asset):
+        return os.path.join(self.directory, f"{safe_name(asset)}.json")
+
+    def get(self, asset, criterion=None):
+        # zapisany rząd albo None (brak pliku / uszkodzony plik / wybrany innym kryterium)
+        try:
+            with open(self._path(asset), encoding="utf-8") as f:
+                record = json.load(f)
+            order = tuple(int(x) for x in record["order"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if len(order) != 3 or (criterion is not None and record.get("criterion") != criterion):
+            return None
+        return order
+
+    def put(self, asset, order, criterion, score, nobs):
+        path = self._path(asset)
+        record = {
+            "asset": str(asset),
+            "order": list(order),
+            "criterion": criterion,
+            "score": float(score),
+            "nobs": int(nobs),                                    # na ilu obserwacjach wybierano rząd
+            "updated": datetime.now().isoformat(timespec="seconds"),
+        }
+        try:
+            write_json(path, record)
+        except OSError as e:
+            print("Błąd zapisu rzędu modelu:", e)
+
+
+def select_order_cached(values, asset, directory, refresh=False, criterion="aic", **kwargs):
+    # rząd zapisany dla aktywa albo (brak zapisu / refresh=True) wynik select_order, zapisywany na później;
+    # gdy żaden kandydat się nie dopasuje - forecast.ORDER
+    store = OrderStore(directory)
+    order = None if refresh else store.get(asset, criterion)
+    if order is not None:
+        return order
+
+    order, scores = select_order(values, criterion=criterion, **kwargs)
+    if order is None:
+        return forecast.ORDER
+    store.put(asset, order, criterion, scores[order][1], len(values))
+    return order
@@ -0,0 +1,76 @@
+# -------------------
+# Zapisane parametry dopasowanych modeli (start "na ciepło" kolejnych dopasowań)
+# -------------------
+# Jeden plik JSON na parę (aktywo, rząd modelu), zapisywany atomowo (os.replace),
+# więc kilka procesów (np. pula w coa.batch) może zapisywać różne aktywa jednocześnie.
+# safe_name i write_json używa też coa.order_select.OrderStore.
+
+import json
+import os
+import re
+from datetime import datetime
+
+import numpy as np
+
+from coa import forecast
+
+
+def safe_name(asset):
+    # nazwa aktywa jako bezpieczna nazwa pliku
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", str(asset))
+
+
+def write_json(path, record):
+    # zapis do pliku tymczasowego i os.replace - czytelnik nie zobaczy połowy pliku; błąd zapisu -> OSError
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=2)
+    os.replace(tmp, path)
+
+
+class ParamsStore:
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, asset, order):
+        return os.path.join(self.directory, f"{safe_name(asset)}_{'_'.join(map(str, order))}.json")
+
+    def get(self, asset, order):
+        # parametry z ostatniego dopasowania albo None (brak pliku / uszkodzony plik / inna liczba parametrów)
+        try:
+            with open(self._path(asset, order), encoding="utf-8") as f:
+                params = np.asarray(json.load(f)["params"], dtype=np.float64)
+        except (OSError, ValueError, KeyError):
+            return None
+        return params if np.all(np.isfinite(params)) else None
+
+    def put(self, asset, order, params, nobs):
+        path = self._path(asset, order)
+        record = {
+            "asset": str(asset),
+            "order": list(order),
+            "params": [float(p) for p in params],
+            "nobs": int(nobs),                                    # na ilu obserwacjach dopasowano model
+            "updated": datetime.now().isoformat(timespec="seconds"),
+        }
+        try:
+            write_json(path, record)
+        except OSError as e:
+            print("Błąd zapisu parametrów modelu:", e)
+
+
+# ===============================
+# Predykcja ze startem "na ciepło"
+# ===============================
+def predict_path_warm(values, steps, order, asset, directory, progress=None, refit=True, window=None):
+    # forecast.predict_path z parametrami startowymi z poprzedniego dopasowania tego aktywa;
+    # po dopasowaniu zapisuje nowe parametry (funkcja modułu - można ją wysłać do procesu roboczego/puli)
+    store = ParamsStore(directory)
+    start = store.get(asset, order)
+    mean, se = forecast.predict_path(values, steps, order, progress, refit, start_params=start, window=window)
+
+    params = forecast.current_params()
+    if se is not None and params is not None and (start is None or not np.array_equal(params, start)):
+        store.put(asset, order, params, len(values) if window is None else window[1] - window[0])
+    return mean, se
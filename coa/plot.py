@@ -0,0 +1,202 @@
+# -------------------
+# Wykres cen z predykcjami (matplotlib, bez zależności od Tkintera)
+# -------------------
+# Artyści (linie, pasma, adnotacja) powstają raz i przy odświeżeniu dostają tylko nowe dane.
+# Nakładka z predykcjami jest "animowana": gdy zakres osi się nie zmienia, przywracamy zapamiętane
+# tło (oś + dane historyczne) i dorysowujemy tylko nakładkę (blitting), zamiast rysować całą figurę.
+# Zakres osi liczymy z danych historycznych z zapasem na prognozy (RESERVE_FRACTION okna w prawo, HEADROOM
+# w pionie), więc kolejne predykcje zwykle mieszczą się w narysowanym tle i zmieniają tylko nakładkę.
+
+import matplotlib.dates as mdates
+import numpy as np
+from matplotlib.collections import PolyCollection
+
+from coa import forecast
+from coa.downsample import lttb
+
+POINTS_PER_PIXEL = 2   # ile punktów danych historycznych rysujemy na piksel szerokości osi (LTTB)
+PRED_COLOR = "red"
+CI_COLOR = "#FA8078"
+RESERVE_FRACTION = 0.25   # miejsce na prognozy za ostatnią obserwacją (ułamek okna, najwyżej MAX_HORIZON kroków)
+HEADROOM = 0.1            # zapas zakresu osi Y (ułamek rozpiętości danych) na prognozy i pasma
+
+
+class PricePlot:
+    def __init__(self, fig, canvas):
+        self.fig = fig
+        self.canvas = canvas
+        self.ax = fig.add_subplot(111)  # dodaje jedną oś (1x1, pierwszy wykres)
+        self.ax.set_title("Wykres danych")
+        self.ax.set_xlabel("Time")
+        self.ax.set_ylabel("Value")
+        self.ax.grid(True)
+
+        # ---- oś X z datami (dane podajemy jako liczby dni matplotlib - date2num) ----
+        self.ax.xaxis.axis_date()
+        self.ax.xaxis.set_major_locator(mdates.MonthLocator(interval=3))  # Ustawia, co ile mają być główne ticki na osi X (daty)
+        self.ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %Y'))  # Formatuje etykiety ticków, czyli jak będą wyglądać daty na osi X.
+
+        # ---- dane oryginalne: niebieska linia (część tła) ----
+        self.obs_line, = self.ax.plot([], [], color='blue', linestyle='-')
+
+        # ---- nakładka z predykcjami ----
+        self.fan = [PolyCollection([], facecolor=CI_COLOR, alpha=0.25, linewidth=0, animated=True)
+                    for _ in forecast.FAN_ALPHAS]   # pasma 95%, 80%, 50% (nakładają się, środek jest najciemniejszy)
+        for band in self.fan:
+            self.ax.add_collection(band, autolim=False)
+        self.ci_line, = self.ax.plot([], [], color=CI_COLOR, linestyle="dashed", linewidth=1.5, alpha=0.8,
+                                     animated=True)  # przedział ufności pojedynczej predykcji
+        self.pred_line, = self.ax.plot([], [], color=PRED_COLOR, linestyle='-', animated=True)
+            # linia łącząca ostatni punkt danych oryginalnych z predykcjami
+        self.pred_dots, = self.ax.plot([], [], color=PRED_COLOR, marker='o', markersize=6, linestyle='',
+                                       animated=True)  # czerwone kropki dla wszystkich predykcji
+        self.annotation = self.ax.annotate(
+            "",
+            xy=(0, 0),                       # punkt, do którego strzałka będzie wskazywać (ustawiany w update)
+            xytext=(15, 15),                 # przesunięcie tekstu względem punktu
+            textcoords="offset points",      # przesunięcie (15, 15) jest w punktach, a nie w jednostkach danych osi X/Y
+            bbox=dict(boxstyle="round,pad=0.4", fc="#D5F5F7", ec="#E02519", lw=1),  # obramowanie tekstu
+            arrowprops=dict(arrowstyle="->", color="#E02519"),                         # strzałka wskazująca punkt
+            fontsize=9,
+            visible=False,
+            animated=True)
+        self.overlay = [*self.fan, self.ci_line, self.pred_line, self.pred_dots, self.annotation]
+
+        self._background = None   # zapamiętany obraz figury bez nakładki
+        self._limits = None       # zakres osi, dla którego tło jest aktualne
+        self._ylim = None         # zakres osi Y z zapasem - zostaje, dopóki dane się w nim mieszczą
+        self._obs_data = None     # dane historyczne narysowane w tle
+        self._obs_full = None     # pełne (niezredukowane) dane historyczne - do zapisu w wysokiej rozdzielczości
+        self._exporting = False
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    # ===============================
+    # Aktualizacja danych
+    # ===============================
+    def update(self, dates, values, is_prediction, last_forecast=None, title=""):
+        # dates/values/is_prediction - okno danych do pokazania (predykcje są zawsze na końcu)
+        # last_forecast - (prognozy, błędy standardowe) ostatniej ścieżki predykcji albo None
+        x = mdates.date2num(dates)
+        original_len = len(x) - int(np.count_nonzero(is_prediction))
+        has_pred = original_len < len(x)
+
+        # ---- dane historyczne: przy dużym oknie tylko punkty wybrane przez LTTB (liczba zależna od szerokości osi) ----
+        obs_x, obs_y = x[:original_len], values[:original_len]
+        self._obs_full = (obs_x, obs_y)
+        max_points = max(int(self.ax.bbox.width * POINTS_PER_PIXEL), 100)
+        if len(obs_x) > max_points:
+            keep = lttb(obs_x, obs_y, max_points)
+            obs_x, obs_y = obs_x[keep], obs_y[keep]
+        self.obs_line.set_data(obs_x, obs_y)
+        start = max(original_len - 1, 0)
+        self.pred_line.set_data(x[start:] if has_pred else [], values[start:] if has_pred else [])
+        self.pred_dots.set_data(x[original_len:], values[original_len:])
+
+        # ---- przedział ufności / wykres wachlarzowy ----
+        lower = upper = None
+        bands = []
+        self.ci_line.set_visible(False)
+        if has_pred and last_forecast is not None and last_forecast[1] is not None:
+            mean, se = last_forecast
+            steps = min(len(mean), len(x) - original_len)  # ile kroków ostatniej prognozy jest w oknie
+            mean, se = mean[-steps:], se[-steps:]
+            lower, upper = (b[-1] for b in forecast.interval(mean, se))  # 95% dla ostatniego punktu
+            if steps == 1:
+                self.ci_line.set_data([x[-1], x[-1]], [lower, upper])
+                self.ci_line.set_visible(True)
+            else:
+                band_x = x[-steps:]
+                for alpha in forecast.FAN_ALPHAS:
+                    band_low, band_high = forecast.interval(mean, se, alpha)
+                    bands.append(np.column_stack([np.concatenate([band_x, band_x[::-1]]),
+                                                  np.concatenate([band_low, band_high[::-1]])]))
+        for band, verts in zip(self.fan, bands + [None] * len(self.fan)):
+            band.set_verts([verts] if verts is not None else [])
+
+        # ---- adnotacja z wartością ostatniej predykcji ----
+        self.annotation.set_visible(has_pred)
+        if has_pred:
+            pred_value = values[-1]
+            if lower is not None:
+                self.annotation.set_text(f"Predykcja\n{pred_value:.4f}\nCI: [{lower:.2f}, {upper:.2f}]")
+            else:
+                self.annotation.set_text(f"Predykcja\n{pred_value:.4f}")
+            self.annotation.xy = (x[-1], pred_value)
+
+        self.ax.set_title(f"{title}")  # tytuł wykresu
+
+        # ---- zakres osi: dane historyczne + zapas na prognozy (stały między kolejnymi predykcjami) ----
+        extra_y = [values[original_len:]] + [verts[:, 1] for verts in bands[:1]]  # 95% zawiera pozostałe pasma
+        if lower is not None:
+            extra_y.append([lower, upper])
+        self._set_limits(obs_x, obs_y, x[original_len:], np.concatenate(extra_y))
+        self._render()
+
+    def _set_limits(self, obs_x, obs_y, pred_x, pred_y):
+        # Oś X: okno danych historycznych + zapas w całych blokach kroków - prognoza zmienia zakres dopiero,
+        # gdy wyjdzie poza zarezerwowany blok. Oś Y: poprzedni zakres, jeśli dane historyczne są te same,
+        # a prognozy się w nim mieszczą; inaczej zakres danych z zapasem HEADROOM.
+        margin_x, margin_y = self.ax.margins()
+        full_x = self._obs_full[0]  # krok szeregu z pełnych danych - po LTTB odstęp punktów to szerokość kubełka
+        step = full_x[-1] - full_x[-2] if len(full_x) > 1 else 1.0
+        block = min(max(int(len(full_x) * RESERVE_FRACTION), 1), forecast.MAX_HORIZON) * step
+        ahead = pred_x[-1] - obs_x[-1] if len(pred_x) else 0.0
+        right = obs_x[-1] + max(int(np.ceil(ahead / block)), 1) * block
+        span_x = right - obs_x[0]
+        self.ax.set_xlim(obs_x[0] - margin_x * span_x, right + margin_x * span_x)
+
+        low = min(obs_y.min(), pred_y.min()) if len(pred_y) else obs_y.min()
+        high = max(obs_y.max(), pred_y.max()) if len(pred_y) else obs_y.max()
+        if self._ylim is None or self._obs_changed() or low < self._ylim[0] or high > self._ylim[1]:
+            pad = (high - low or abs(high) or 1.0) * (HEADROOM + margin_y)
+            self._ylim = (low - pad, high + pad)
+        self.ax.set_ylim(*self._ylim)
+
+    # ===============================
+    # Rysowanie: pełne albo tylko nakładka
+    # ===============================
+    def _render(self):
+        limits = (self.ax.get_xlim(), self.ax.get_ylim(), self.ax.get_title())
+        if self._background is not None and limits == self._limits and not self._obs_changed():
+            # tło (oś, siatka, dane historyczne) się nie zmieniło - przerysowujemy tylko nakładkę
+            self.canvas.restore_region(self._background)
+            self._draw_overlay()
+            self.canvas.blit(self.fig.bbox)
+        else:
+            self._limits = limits
+            self.fig.autofmt_xdate(rotation=45)  # obraca etykiety osi X, żeby się nie nakładały
+            self.canvas.draw()                   # pełne rysowanie; _on_draw zapamięta tło i dorysuje nakładkę
+
+    def _obs_changed(self):
+        # tło trzeba odświeżyć, jeśli zmieniła się linia danych historycznych
+        data = self.obs_line.get_xydata()
+        return self._obs_data is None or not np.array_equal(data, self._obs_data)
+
+    def _on_draw(self, event):
+        if self._exporting:
+            return
+        self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._obs_data = self.obs_line.get_xydata().copy()
+        self._draw_overlay()
+
+    def _draw_overlay(self):
+        for artist in self.overlay:
+            self.ax.draw_artist(artist)
+
+    # ===============================
+    # Zapis do pliku
+    # ===============================
+    def save(self, file_path, **kwargs):
+        # przy zapisie matplotlib rysuje też animowanych artystów; _on_draw nie może wtedy podmienić tła
+        # plik (np. 300 dpi) ma więcej pikseli niż ekran, więc zapisujemy pełne dane zamiast wersji z LTTB
+        shown = self.obs_line.get_data()
+        self._exporting = True
+        try:
+            if self._obs_full is not None:
+                self.obs_line.set_data(*self._obs_full)
+            self.fig.savefig(file_path, **kwargs)
+        finally:
+            self.obs_line.set_data(*shown)
+            self._exporting = False
+            self._background = None
+            self.canvas.draw()  # savefig mógł zmienić stan bufora - rysujemy od nowa
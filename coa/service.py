@@ -0,0 +1,345 @@
+# -------------------
+# Lokalna usługa prognoz HTTP/JSON: python -m coa.service --port 8765 [--data Data] [--cache]
+# -------------------
+# POST /forecast  {"dataset": "ETH_prices", "horizon": 7}  albo  {"values": [101.2, 102.5, ...], "horizon": 1}
+#   opcjonalnie: "column" (ticker albo indeks kolumny pliku), "order": [5, 1, 0], "alpha": 0.05,
+#   "fast": "ols" / "yw" (rzędy bez części MA), "fit_window": "365" albo zakres dat dd.mm.yyyy-dd.mm.yyyy
+# GET /datasets - pliki CSV w katalogu danych; GET /metrics - metryki (coa.metrics); GET /health
+# -------------------
+# Dopasowania statsmodels liczy stała pula procesów (spawn, statsmodels importowany raz na proces);
+# szybka ścieżka AR liczy się od razu w wątku żądania. Identyczne żądania (ten sam klucz coa.cache) w trakcie
+# liczenia czekają na ten sam wynik zamiast uruchamiać kolejne dopasowanie, a gotowe wyniki trafiają
+# do ForecastCache (pamięć, opcjonalnie dysk). Serwer domyślnie słucha tylko na 127.0.0.1.
+
+import argparse
+import importlib
+import json
+import math
+import multiprocessing as mp
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from coa import forecast
+from coa.batch import _forecast_column, _forecast_column_timed
+from coa.cache import ForecastCache, default_cache_dir, forecast_key
+from coa.fast_ar import METHODS
+from coa.metrics import CONTENT_TYPE, METRICS, inc
+from coa.timing import TIMINGS, span
+
+HOST = "127.0.0.1"
+PORT = 8765
+DATA_DIR = "Data"
+MAX_BODY = 64 << 20     # największe przyjmowane ciało żądania (ok. 3 mln liczb w JSON)
+TIMEOUT = 600           # ile sekund żądanie czeka na wynik dopasowania
+WORKER_IMPORTS = ("pandas", "statsmodels.tsa.arima.model")
+ENDPOINTS = ("/forecast", "/datasets", "/metrics", "/health")  # etykieta endpoint w metrykach; inne -> "other"
+
+
+class RequestError(ValueError):
+    # błąd w żądaniu -> odpowiedź z kodem status (400, 404, ...) i opisem
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _warmup():
+    for name in WORKER_IMPORTS:
+        importlib.import_module(name)
+
+
+class ForecastService:
+    # Logika usługi bez HTTP (można jej używać bezpośrednio, np. w testach albo innym serwerze)
+
+    def __init__(self, data_dir=DATA_DIR, workers=None, cache=None, params_dir=None):
+        self.data_dir = data_dir
+        self.cache = cache if cache is not None else ForecastCache()
+        self.params_dir = params_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = self._new_pool()
+        self._inflight = {}      # klucz -> Future dopasowania w toku (łączenie identycznych żądań)
+        self._datasets = {}      # ścieżka -> ((mtime_ns, rozmiar), (daty, wartości, tickery))
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context("spawn"), initializer=_warmup)
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    def _fit(self, task):
+        # dopasowanie w puli; gdy proces puli zginął (np. brak pamięci), pula jest zepsuta na stałe -
+        # tworzymy nową i ponawiamy to jedno zadanie (drugi błąd dostaje tylko bieżące żądanie)
+        pool = self.pool
+        try:
+            return pool.submit(_forecast_column_timed, task).result(timeout=TIMEOUT)
+        except BrokenProcessPool:
+            with self._lock:
+                if self.pool is pool:  # inny wątek mógł już odtworzyć pulę
+                    print("Proces puli zakończył się nieoczekiwanie - nowa pula", file=sys.stderr)
+                    inc("errors", where="pool")
+                    self.pool = self._new_pool()
+                pool = self.pool
+            return pool.submit(_forecast_column_timed, task).result(timeout=TIMEOUT)
+
+    # ===============================
+    # Zbiory danych z katalogu
+    # ===============================
+    def datasets(self):
+        try:
+            return sorted(os.path.splitext(name)[0] for name in os.listdir(self.data_dir) if name.endswith(".csv"))
+        except OSError:
+            return []
+
+    def load(self, name):
+        # (daty, wartości (n, k), tickery) pliku <data_dir>/<name>.csv; parsowany ponownie tylko po zmianie pliku
+        if str(name) not in self.datasets():  # tylko nazwy z katalogu - bez ścieżek spoza niego
+            raise RequestError(f"nie ma zbioru danych: {name}", 404)
+        path = os.path.join(self.data_dir, f"{name}.csv")
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        from coa.ingest import read_prices
+        with self._load_lock:  # równoczesne żądania tego samego pliku - parsowanie tylko raz
+            cached = self._datasets.get(path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            with span("load"):
+                data = read_prices(path)
+            self._datasets[path] = (signature, data)
+        return data
+
+    # ===============================
+    # Prognoza dla jednego żądania
+    # ===============================
+    def forecast(self, request):
+        start = time.perf_counter()
+        if not isinstance(request, dict):
+            raise RequestError("oczekiwany obiekt JSON")
+        steps = _int(request.get("horizon", 1), "horizon")
+        if not 1 <= steps <= forecast.MAX_HORIZON:
+            raise RequestError(f"horizon musi być z zakresu 1-{forecast.MAX_HORIZON}")
+        order = request.get("order", forecast.ORDER)
+        if not (isinstance(order, (list, tuple)) and len(order) == 3):
+            raise RequestError("order: trzy liczby [p, d, q]")
+        order = tuple(_int(x, "order") for x in order)
+        alpha = request.get("alpha", forecast.ALPHA)
+        if not isinstance(alpha, (int, float)) or not 0 < alpha < 1:
+            raise RequestError("alpha musi być z zakresu (0, 1)")
+        fast = request.get("fast")
+        if fast is not None and fast not in METHODS:
+            raise RequestError(f"fast: jedna z {', '.join(METHODS)}")
+        if fast and order[2]:
+            raise RequestError("fast: tylko rzędy bez części MA (q = 0)")
+
+        # ---- szereg: z pliku w katalogu danych albo z żądania ----
+        with span("extract"):
+            dates, values, ticker = self._series(request)
+            spec = str(request.get("fit_window") or "").strip()
+            if dates is None and spec and not spec.isdigit():
+                raise RequestError("fit_window z datami wymaga zbioru danych (dataset)")
+            try:
+                window = forecast.fit_window(spec, dates if dates is not None else np.zeros(len(values), "datetime64[s]"))
+            except ValueError:
+                raise RequestError("fit_window: liczba obserwacji albo zakres dat dd.mm.yyyy-dd.mm.yyyy")
+
+        method = fast or "mle"
+        key = forecast_key(values, order, steps, method, window)
+        params_dir = self.params_dir if ticker else None  # start "na ciepło" tylko dla nazwanych aktywów
+        (mean, se), source = self._compute(key, (values, steps, order, ticker, params_dir, method, window))
+
+        response = {
+            "dataset": request.get("dataset"),
+            "ticker": ticker,
+            "order": list(order),
+            "horizon": steps,
+            "method": method,
+            "nobs": len(values),
+            "forecast": mean.tolist(),
+            "se": se.tolist() if se is not None else None,
+            "lower": None,
+            "upper": None,
+            "dates": None,
+            "fallback": se is None,  # model się nie dopasował - powtórzona ostatnia wartość, bez przedziału
+            "source": source,        # computed / cache / coalesced
+        }
+        if se is not None:
+            lower, upper = forecast.interval(mean, se, alpha)
+            response["lower"], response["upper"] = lower.tolist(), upper.tolist()
+        if dates is not None:
+            from coa.ingest import date_format, time_step
+            next_dates = dates[-1] + np.arange(1, steps + 1) * time_step(dates)
+            fmt = date_format(dates)
+            response["dates"] = [d.item().strftime(fmt) for d in next_dates]
+        response["ms"] = round((time.perf_counter() - start) * 1000, 3)
+        return response
+
+    def _series(self, request):
+        # (daty albo None, wartości float64 bez braków, ticker)
+        if "dataset" in request:
+            dates, values, tickers = self.load(request["dataset"])
+            column = request.get("column", 0)
+            if isinstance(column, str) and column in tickers:
+                column = tickers.index(column)
+            if isinstance(column, bool) or not isinstance(column, int) or not 0 <= column < len(tickers):
+                raise RequestError(f"column: jeden z {', '.join(tickers)} albo indeks 0-{len(tickers) - 1}")
+            valid = ~np.isnan(values[:, column])
+            return dates[valid], np.ascontiguousarray(values[valid, column]), tickers[column]
+        if "values" in request:
+            raw = request["values"]
+            # tylko liczby JSON (null = brak danych) - np.asarray przyjąłby też napisy typu "1.5"
+            if not isinstance(raw, list) or not all(
+                    x is None or (isinstance(x, (int, float)) and not isinstance(x, bool)) for x in raw):
+                raise RequestError("values: lista liczb")
+            values = np.asarray(raw, dtype=np.float64)
+            if not len(values):
+                raise RequestError("values: niepusta lista liczb")
+            values = values[~np.isnan(values)]
+            if not np.all(np.isfinite(values)) or not len(values):
+                raise RequestError("values: tylko liczby skończone")
+            return None, values, request.get("ticker")
+        raise RequestError("podaj dataset albo values")
+
+    def _compute(self, key, task):
+        # ((prognozy, błędy), źródło): pamięć podręczna -> dopasowanie w toku -> nowe dopasowanie
+        cached = self.cache.get(key)
+        if cached is not None:
+            inc("cache_hits")
+            return cached, "cache"
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            inc("coalesced")
+            return future.result(timeout=TIMEOUT), "coalesced"
+
+        try:
+            method = task[5]
+            if method == "mle":
+                result, spans = self._fit(task)
+                TIMINGS.merge(spans)
+            else:
+                result = _forecast_column(task)  # AR w postaci zamkniętej - ułamki ms, bez puli
+            inc("fits", method=method)
+            if result[1] is None:
+                inc("fallbacks")
+            else:
+                self.cache.put(key, result)
+            future.set_result(result)
+            return result, "computed"
+        except BaseException as e:
+            future.set_exception(e)  # czekający na ten sam klucz dostaną ten sam błąd
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+def _int(value, name):
+    # json.loads przyjmuje też Infinity i NaN - int() by ich nie przyjął (500 zamiast 400)
+    if (isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value)
+            or int(value) != value):
+        raise RequestError(f"{name}: oczekiwana liczba całkowita")
+    return int(value)
+
+
+# ===============================
+# Serwer HTTP
+# ===============================
+def make_server(service, host=HOST, port=PORT):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, payload, content_type="application/json; charset=utf-8"):
+            body = payload if isinstance(payload, bytes) else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            path = self.path.split("?")[0]
+            inc("requests", endpoint=path if path in ENDPOINTS else "other", status=status)  # ograniczona liczba serii
+
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path == "/health":
+                self._send(200, {"status": "ok"})
+            elif path == "/datasets":
+                self._send(200, {"datasets": service.datasets()})
+            elif path == "/metrics":
+                self._send(200, METRICS.render().encode("utf-8"), CONTENT_TYPE)
+            else:
+                self._send(404, {"error": "nieznany adres"})
+
+        def do_POST(self):
+            if self.path.split("?")[0] != "/forecast":
+                self._send(404, {"error": "nieznany adres"})
+                return
+            try:
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    raise RequestError("niepoprawny nagłówek Content-Length")
+                if length > MAX_BODY:
+                    raise RequestError("za duże żądanie", 413)
+                try:
+                    request = json.loads(self.rfile.read(length) or b"null")
+                except ValueError:
+                    raise RequestError("niepoprawny JSON")
+                self._send(200, service.forecast(request))
+            except RequestError as e:
+                self._send(e.status, {"error": str(e)})
+            except Exception as e:
+                print("Błąd usługi prognoz:", repr(e), file=sys.stderr)
+                inc("errors", where="forecast")
+                self._send(500, {"error": repr(e)})
+
+        def log_message(self, format, *args):
+            pass  # bez wpisu na stderr przy każdym żądaniu
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m coa.service",
+                                     description="Lokalna usługa prognoz ARIMA (HTTP/JSON).")
+    parser.add_argument("--host", default=HOST, help=f"adres nasłuchu (domyślnie {HOST})")
+    parser.add_argument("--port", type=int, default=PORT, help=f"port (domyślnie {PORT})")
+    parser.add_argument("--data", default=DATA_DIR, help=f"katalog z plikami CSV dostępnymi jako dataset (domyślnie {DATA_DIR})")
+    parser.add_argument("--workers", type=int, help="liczba procesów dopasowujących modele (domyślnie liczba rdzeni)")
+    parser.add_argument("--cache", action="store_true", help="wyniki zapamiętywane także na dysku (jak python -m coa --cache)")
+    parser.add_argument("--warm-start", action="store_true", help="dopasowania startują od zapisanych parametrów aktywa")
+    args = parser.parse_args(argv)
+
+    cache_dir = default_cache_dir()
+    cache = ForecastCache(directory=os.path.join(cache_dir, "forecasts")) if args.cache else ForecastCache()
+    service = ForecastService(args.data, args.workers, cache,
+                              os.path.join(cache_dir, "params") if args.warm_start else None)
+    try:
+        server = make_server(service, args.host, args.port)
+    except OSError as e:
+        service.close()
+        parser.error(f"nie można nasłuchiwać na {args.host}:{args.port}: {e}")
+    print(f"Usługa prognoz: http://{args.host}:{server.server_address[1]}/forecast", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
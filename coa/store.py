@@ -0,0 +1,90 @@
+# -------------------
+# Kolumnowy magazyn szeregu cen (NumPy)
+# -------------------
+
+import numpy as np
+
+
+class SeriesStore:
+    # Trzyma szereg czasowy w trzech tablicach NumPy:
+    #   dates         - datetime64[s] (indeks czasu)
+    #   values        - float64 (ceny)
+    #   is_prediction - bool (True dla punktów wygenerowanych przez model)
+    # Tablice mają zapas pojemności, więc dopisywanie predykcji nie kopiuje całego szeregu.
+
+    def __init__(self):
+        self._dates = np.empty(0, dtype="datetime64[s]")
+        self._values = np.empty(0, dtype=np.float64)
+        self._mask = np.empty(0, dtype=bool)
+        self._size = 0
+
+    # ===============================
+    # Wczytanie całego szeregu
+    # ===============================
+    def load(self, dates, values):
+        dates = np.asarray(dates, dtype="datetime64[s]")
+        values = np.asarray(values, dtype=np.float64)
+        if dates.shape != values.shape:
+            raise ValueError("Liczba dat i wartości musi być taka sama")
+
+        keep = ~np.isnat(dates) & ~np.isnan(values)  # pomijamy puste / błędne wiersze
+        self._dates = dates[keep].copy()
+        self._values = values[keep].copy()
+        self._mask = np.zeros(self._dates.shape[0], dtype=bool)
+        self._size = self._dates.shape[0]
+
+    def drop_predictions(self):
+        # usuwa prognozy z końca szeregu (np. przed dopisaniem nowych danych z pliku)
+        predicted = np.flatnonzero(self._mask[:self._size])
+        if len(predicted):
+            self._size = int(predicted[0])
+
+    # ===============================
+    # Dopisanie punktów na końcu
+    # ===============================
+    def extend(self, dates, values, is_prediction=True):
+        # dopisanie kilku punktów naraz (np. cała ścieżka prognozy); pojemność rośnie dwukrotnie (koszt zamortyzowany)
+        n = len(values)
+        if self._size + n > self._values.shape[0]:
+            self._grow(max(16, 2 * (self._size + n)))
+        end = self._size + n
+        self._dates[self._size:end] = np.asarray(dates, dtype="datetime64[s]")
+        self._values[self._size:end] = values
+        self._mask[self._size:end] = is_prediction
+        self._size = end
+
+    def _grow(self, capacity):
+        for name in ("_dates", "_values", "_mask"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    # ===============================
+    # Odczyt (widoki, bez kopiowania)
+    # ===============================
+    def __len__(self):
+        return self._size
+
+    @property
+    def dates(self):
+        return self._dates[:self._size]
+
+    @property
+    def values(self):
+        return self._values[:self._size]
+
+    @property
+    def is_prediction(self):
+        return self._mask[:self._size]
+
+    def tail(self, n):
+        # ostatnie n punktów: (daty, wartości, maska predykcji)
+        start = max(self._size - n, 0)
+        return (self._dates[start:self._size],
+                self._values[start:self._size],
+                self._mask[start:self._size])
+
+    def tail_observed(self, n):
+        # ostatnie n punktów danych z pliku i wszystkie prognozy za nimi (prognozy są zawsze na końcu)
+        return self.tail(n + int(np.count_nonzero(self.is_prediction)))
@@ -0,0 +1,124 @@
+# -------------------
+# Syntetyczne pliki cen do testów skali: python -m coa.synthetic duzy.csv --rows 1000000 --freq minute --assets 4
+# -------------------
+# Pliki w formacie Data/*.csv ("Ticker;XXX-USD", daty dd.mm.yyyy albo dd.mm.yyyy HH:MM dla danych godzinowych
+# i minutowych). Ceny: geometryczny ruch Browna ze zmienną w czasie zmiennością - logarytm zmienności to
+# proces AR(1), więc okresy dużych i małych wahań trwają (skupianie zmienności), a rozkład zwrotów ma grube ogony.
+# Aktywa są skorelowane przez wspólny czynnik rynkowy. Generujemy i zapisujemy porcjami (CHUNK wierszy),
+# więc pamięć nie rośnie z długością pliku; ten sam seed daje ten sam plik.
+
+import argparse
+import sys
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+from coa.ingest import DATE_FORMAT, SEP
+
+FREQUENCIES = {                 # krok szeregu i jego długość w latach (rynek kryptowalut działa całą dobę)
+    "daily": (np.timedelta64(1, "D"), 1 / 365),
+    "hourly": (np.timedelta64(1, "h"), 1 / (365 * 24)),
+    "minute": (np.timedelta64(1, "m"), 1 / (365 * 24 * 60)),
+}
+START = "01.01.2015"
+PRICE = 100.0       # cena początkowa każdego aktywa
+DRIFT = 0.05        # roczny dryf logarytmu ceny
+VOL = 0.6           # średnia roczna zmienność (rząd wielkości dla BTC/ETH)
+PERSISTENCE = 0.97  # autokorelacja logarytmu zmienności z dnia na dzień
+VOL_OF_VOL = 0.5    # odchylenie standardowe logarytmu zmienności (rozkład stacjonarny)
+CORR = 0.6          # korelacja zwrotów między aktywami (wspólny czynnik)
+CHUNK = 1_000_000
+
+
+def tickers(assets):
+    return [f"SYN{i + 1}-USD" for i in range(assets)]
+
+
+def first_date(rows, freq="daily", start=START):
+    # pierwsza data szeregu; ValueError, gdy ostatnia wypadłaby poza zakres dat pandas
+    step = FREQUENCIES[freq][0]
+    first = np.datetime64(datetime.strptime(start, DATE_FORMAT), "s")
+    if first + (rows - 1) * step.astype("timedelta64[s]") > np.datetime64(pd.Timestamp.max, "s"):
+        raise ValueError(f"{rows} wierszy ({freq}) wychodzi poza rok 2262 (limit dat pandas) - "
+                         f"wybierz gęstszą częstotliwość albo wcześniejszą datę początkową")
+    return first
+
+
+def generate(rows, assets=1, freq="daily", start=START, seed=None, price=PRICE, drift=DRIFT, vol=VOL,
+             persistence=PERSISTENCE, vol_of_vol=VOL_OF_VOL, corr=CORR, chunk=CHUNK):
+    # Generator porcji (daty datetime64[s], ceny (m, assets)) - razem `rows` wierszy
+    step, dt = FREQUENCIES[freq]
+    first = first_date(rows, freq, start)
+    rng = np.random.default_rng(seed)
+
+    # ---- parametry na jeden krok: ta sama zmienność zmienności niezależnie od częstotliwości ----
+    phi = persistence ** (dt * 365)
+    eta_scale = vol_of_vol * np.sqrt(1 - phi ** 2)
+    state = phi * rng.normal(0.0, vol_of_vol, (1, assets))  # stan filtru AR(1) między porcjami (zi dla lfilter)
+    log_price = np.full(assets, np.log(price))
+
+    for offset in range(0, rows, chunk):
+        m = min(chunk, rows - offset)
+        log_vol, state = lfilter([1.0], [1.0, -phi], eta_scale * rng.standard_normal((m, assets)), axis=0, zi=state)
+        sigma = vol * np.exp(log_vol - vol_of_vol ** 2)  # E[sigma^2] = vol^2
+        shocks = np.sqrt(corr) * rng.standard_normal((m, 1)) + np.sqrt(1 - corr) * rng.standard_normal((m, assets))
+        returns = (drift - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * shocks
+        path = log_price + np.cumsum(returns, axis=0)
+        log_price = path[-1]
+        yield first + (offset + np.arange(m)) * step, np.exp(path)
+
+
+def format_dates(dates, freq):
+    # datetime64 -> "dd.mm.yyyy" / "dd.mm.yyyy HH:MM" bez strftime dla każdego wiersza: tekst ISO z NumPy
+    # ("yyyy-mm-ddTHH:MM") jako macierz bajtów, z której przestawiamy kolumny znaków
+    iso = np.datetime_as_string(dates, unit="D" if freq == "daily" else "m").astype("S")
+    chars = iso.view(np.uint8).reshape(len(iso), -1)
+    layout = [8, 9, ".", 5, 6, ".", 0, 1, 2, 3] + ([" ", 11, 12, ":", 14, 15] if freq != "daily" else [])
+    out = np.empty((len(iso), len(layout)), dtype=np.uint8)
+    for i, source in enumerate(layout):
+        out[:, i] = ord(source) if isinstance(source, str) else chars[:, source]
+    return out.view(f"S{len(layout)}").ravel().astype(str)
+
+
+def write_csv(path, rows, assets=1, freq="daily", names=None, **kwargs):
+    # Zapis pliku CSV; kwargs - parametry generate(). Zwraca liczbę zapisanych wierszy.
+    names = names or tickers(assets)
+    first_date(rows, freq, kwargs.get("start", START))  # błędny zakres dat przed utworzeniem pliku
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(SEP.join(["Ticker", *names]) + "\n")
+        for dates, values in generate(rows, len(names), freq, **kwargs):
+            frame = pd.DataFrame(values, columns=names)
+            frame.insert(0, "Ticker", format_dates(dates, freq))
+            frame.to_csv(f, sep=SEP, header=False, index=False, float_format="%.8g")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m coa.synthetic",
+                                     description="Syntetyczny plik cen (GBM ze skupianiem zmienności) w formacie Data/*.csv.")
+    parser.add_argument("path", help="plik wynikowy CSV")
+    parser.add_argument("--rows", type=int, default=10_000, help="liczba wierszy (domyślnie 10000)")
+    parser.add_argument("--freq", choices=list(FREQUENCIES), default="daily", help="odstęp między wierszami")
+    parser.add_argument("--assets", type=int, default=1, help="liczba kolumn z cenami (domyślnie 1)")
+    parser.add_argument("--tickers", nargs="+", help="nazwy kolumn, np. BTC-USD ETH-USD (zamiast --assets)")
+    parser.add_argument("--start", default=START, help=f"pierwsza data dd.mm.yyyy (domyślnie {START})")
+    parser.add_argument("--seed", type=int, help="ziarno generatora (ten sam seed - ten sam plik)")
+    parser.add_argument("--vol", type=float, default=VOL, help=f"średnia roczna zmienność (domyślnie {VOL})")
+    parser.add_argument("--corr", type=float, default=CORR, help=f"korelacja aktywów 0-1 (domyślnie {CORR})")
+    args = parser.parse_args(argv)
+    if args.rows < 1 or args.assets < 1:
+        parser.error("--rows i --assets muszą być dodatnie")
+    if not 0 <= args.corr <= 1:
+        parser.error("--corr musi być z zakresu 0-1")
+    try:
+        write_csv(args.path, args.rows, args.assets, args.freq, args.tickers, start=args.start, seed=args.seed,
+                  vol=args.vol, corr=args.corr)
+    except ValueError as e:
+        parser.error(str(e))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
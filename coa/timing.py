@@ -0,0 +1,129 @@
+# -------------------
+# Czasy etapów predykcji: load (plik), extract (dane z magazynu), fit, forecast, conf_int, render, export
+# -------------------
+# Nazwane odcinki (span) mierzone perf_counter i zbierane w histogramy o stałych przedziałach (ms, skala
+# logarytmiczna). Każdy proces ma własny rejestr TIMINGS: proces roboczy odsyła odcinki zadania (take),
+# a GUI / coa.batch dokładają je do swojego rejestru (merge). Tylko biblioteka standardowa - moduł jest
+# importowany także przez lekkie moduły (coa.forecast) i proces roboczy.
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+STAGES = ("load", "extract", "fit", "forecast", "conf_int", "render", "export")  # kolejność w podsumowaniach
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)  # górne granice
+KEEP = 1000   # ile ostatnich pomiarów każdego etapu trzymamy do percentyli
+
+
+class Timings:
+    def __init__(self, keep=KEEP):
+        self.keep = keep
+        self.counts = {}    # etap -> liczności w przedziałach BUCKETS_MS (ostatni element: powyżej 10 s)
+        self.samples = {}   # etap -> ostatnie pomiary [s]
+        self.totals = {}    # etap -> [liczba, suma s, max s] (od początku)
+        self.current = {}   # etap -> czas w bieżącym przebiegu [s] (od begin() / take())
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        ms = seconds * 1000
+        bucket = next((i for i, upper in enumerate(BUCKETS_MS) if ms <= upper), len(BUCKETS_MS))
+        with self._lock:
+            if name not in self.counts:
+                self.counts[name] = [0] * (len(BUCKETS_MS) + 1)
+                self.samples[name] = deque(maxlen=self.keep)
+                self.totals[name] = [0, 0.0, 0.0]
+            self.counts[name][bucket] += 1
+            self.samples[name].append(seconds)
+            total = self.totals[name]
+            total[0] += 1
+            total[1] += seconds
+            total[2] = max(total[2], seconds)
+            self.current[name] = self.current.get(name, 0.0) + seconds
+
+    # ===============================
+    # Bieżący przebieg (jedna predykcja)
+    # ===============================
+    def begin(self):
+        with self._lock:
+            self.current = {}
+
+    def take(self):
+        # odcinki bieżącego przebiegu (etap -> s) i początek nowego - np. do odesłania z procesu roboczego
+        with self._lock:
+            current, self.current = self.current, {}
+        return current
+
+    def merge(self, spans):
+        # odcinki zmierzone w innym procesie (wynik take() tamtego procesu)
+        for name, seconds in (spans or {}).items():
+            self.record(name, seconds)
+
+    # ===============================
+    # Podsumowania
+    # ===============================
+    @staticmethod
+    def _ordered(names):
+        return sorted(names, key=lambda name: (STAGES.index(name) if name in STAGES else len(STAGES), name))
+
+    def line(self, spans=None):
+        # jednolinijkowe podsumowanie przebiegu: "extract 0.1 | fit 120.3 | ... ms"
+        spans = self.current if spans is None else spans
+        if not spans:
+            return ""
+        return " | ".join(f"{name} {spans[name] * 1000:.1f}" for name in self._ordered(spans)) + " ms"
+
+    def histogram(self, name):
+        # [(górna granica ms albo None = powyżej ostatniej, liczba pomiarów), ...]
+        with self._lock:
+            counts = list(self.counts.get(name, ()))
+        return list(zip((*BUCKETS_MS, None), counts))
+
+    def summary(self):
+        # etap -> {count, mean_ms, p50_ms, p95_ms, max_ms} (percentyle z ostatnich `keep` pomiarów)
+        result = {}
+        with self._lock:
+            for name in self._ordered(self.totals):
+                count, total, worst = self.totals[name]
+                recent = sorted(self.samples[name])
+                result[name] = {
+                    "count": count,
+                    "mean_ms": total / count * 1000,
+                    "p50_ms": recent[len(recent) // 2] * 1000,
+                    "p95_ms": recent[min(int(len(recent) * 0.95), len(recent) - 1)] * 1000,
+                    "max_ms": worst * 1000,
+                }
+        return result
+
+    def snapshot(self):
+        # etap -> (liczności w przedziałach BUCKETS_MS + powyżej, liczba, suma s) - np. dla coa.metrics
+        with self._lock:
+            return {name: (list(self.counts[name]), self.totals[name][0], self.totals[name][1])
+                    for name in self._ordered(self.totals)}
+
+    def report(self):
+        # tabela tekstowa: statystyki etapów i niezerowe przedziały histogramów
+        lines = [f"{'etap':<10}{'liczba':>8}{'średnio':>10}{'p50':>10}{'p95':>10}{'max':>10}  [ms]"]
+        for name, s in self.summary().items():
+            lines.append(f"{name:<10}{s['count']:>8}{s['mean_ms']:>10.1f}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}"
+                         f"{s['max_ms']:>10.1f}")
+            buckets = [f"{'≤' + format(upper, 'g') if upper is not None else '>' + format(BUCKETS_MS[-1], 'g')}: {n}"
+                       for upper, n in self.histogram(name) if n]
+            lines.append(f"{'':<10}" + ", ".join(buckets))
+        return "\n".join(lines)
+
+    def reset(self):
+        with self._lock:
+            self.counts, self.samples, self.totals, self.current = {}, {}, {}, {}
+
+
+TIMINGS = Timings()   # rejestr tego procesu
+span = TIMINGS.span
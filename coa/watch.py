@@ -0,0 +1,178 @@
+# -------------------
+# Obserwowanie katalogu z plikami cen: python -m coa.watch Data/ --horizon 1
+# -------------------
+# Zmiany wykrywamy odpytywaniem (os.scandir + rozmiar i mtime każdego pliku) - bez zależności od inotify,
+# działa tak samo na każdym systemie i kosztuje jedno wywołanie systemowe na katalog i plik.
+# Ze zmienionych plików czytamy tylko dopisane wiersze (coa.ingest.FileTail); GUI używa tych samych klas.
+
+import argparse
+import fnmatch
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from coa import forecast
+from coa.metrics import METRICS, inc
+from coa.timing import span
+
+INTERVAL = 2.0      # co ile sekund sprawdzamy katalog
+
+
+class FolderWatcher:
+    def __init__(self, directory, pattern="*.csv"):
+        self.directory = directory
+        self.pattern = pattern
+        self._seen = self._scan()  # pliki obecne na starcie traktujemy jako już wczytane
+
+    def _scan(self):
+        # ścieżka -> (mtime_ns, rozmiar) plików pasujących do wzorca
+        found = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.is_file() and fnmatch.fnmatch(entry.name, self.pattern):
+                        stat = entry.stat()
+                        found[os.path.abspath(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            print("Błąd odczytu katalogu:", e)
+        return found
+
+    def files(self):
+        return sorted(self._seen)
+
+    def poll(self):
+        # nowe i zmienione pliki od poprzedniego wywołania (usunięte są pomijane)
+        current = self._scan()
+        changed = sorted(path for path, signature in current.items() if self._seen.get(path) != signature)
+        self._seen = current
+        return changed
+
+
+class DatasetTracker:
+    # Ostatnio wczytane dane każdego pliku; update() dokłada tylko wiersze dopisane od poprzedniego razu
+    # (pełny odczyt przy pierwszym wywołaniu i wtedy, gdy plik zmienił się inaczej niż przez dopisanie)
+
+    def __init__(self, datasets=None):
+        self.datasets = datasets  # opcjonalny coa.dataset_cache.DatasetCache dla pełnych odczytów
+        self._files = {}          # ścieżka -> [daty, wartości, tickery, FileTail]
+
+    def update(self, path):
+        # Zwraca (daty, wartości (n, k), tickery, liczba nowych wierszy)
+        from coa.ingest import FileTail, read_prices
+        state = self._files.get(path)
+        new = state[3].read_new() if state is not None else None
+        if new is None:
+            with span("load"):
+                dates, values, tickers = (self.datasets.read_prices if self.datasets is not None else read_prices)(path)
+            self._files[path] = [dates, values, tickers, FileTail(path, dates)]
+            return dates, values, tickers, len(dates)
+
+        if len(new[0]):
+            state[0] = np.concatenate((state[0], new[0]))
+            state[1] = np.concatenate((state[1], new[1]))
+        return state[0], state[1], state[2], len(new[0])
+
+    def forget(self, path):
+        self._files.pop(path, None)
+
+
+# ===============================
+# Tryb bez GUI: prognozy zmienionych plików na standardowe wyjście
+# ===============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m coa.watch",
+                                     description="Prognozy ARIMA dla plików CSV zmienianych w obserwowanym katalogu.")
+    parser.add_argument("directory", help="katalog z plikami CSV")
+    parser.add_argument("--pattern", default="*.csv", help="wzorzec nazw plików (domyślnie *.csv)")
+    parser.add_argument("--interval", type=float, default=INTERVAL, help=f"co ile sekund sprawdzać (domyślnie {INTERVAL})")
+    parser.add_argument("--horizon", type=int, default=1, help="liczba dni prognozy (domyślnie 1)")
+    parser.add_argument("--order", type=int, nargs=3, default=forecast.ORDER, metavar=("P", "D", "Q"),
+                        help="rząd modelu ARIMA (domyślnie 5 1 0)")
+    parser.add_argument("--workers", type=int, help="liczba procesów (domyślnie liczba rdzeni)")
+    parser.add_argument("--initial", action="store_true", help="na starcie prognozy dla wszystkich plików w katalogu")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="metryki (format Prometheusa) pod http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-file", metavar="PLIK", help="metryki (format Prometheusa) zapisywane do pliku po każdym sprawdzeniu")
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.directory):
+        parser.error(f"nie ma katalogu: {args.directory}")
+    if not 1 <= args.horizon <= forecast.MAX_HORIZON:
+        parser.error(f"--horizon musi być z zakresu 1-{forecast.MAX_HORIZON}")
+
+    from coa.batch import forecast_all
+    from coa.cache import default_cache_dir
+    from coa.dataset_cache import DatasetCache
+    from coa.ingest import date_format
+
+    cache_dir = default_cache_dir()
+    params_dir = os.path.join(cache_dir, "params")  # kolejne dopasowania startują od poprzednich parametrów
+    tracker = DatasetTracker(DatasetCache(os.path.join(cache_dir, "datasets")))
+    watcher = FolderWatcher(args.directory, args.pattern)
+    if args.metrics_port is not None:
+        try:
+            METRICS.serve(args.metrics_port)
+        except OSError as e:
+            parser.error(f"--metrics-port: {e}")
+
+    def run(path, dates, values, tickers):
+        frame = forecast_all(dates, values, tickers, args.horizon, tuple(args.order), workers=args.workers,
+                             params_dir=params_dir)
+        frame.insert(0, "file", os.path.splitext(os.path.basename(path))[0])
+        frame["date"] = frame["date"].dt.strftime(date_format(frame["date"].to_numpy()))
+        return frame
+
+    pending = {}   # ścieżka -> prognoza liczona w tle
+    header = True
+
+    def ingest(path, initial=False):
+        try:
+            dates, values, tickers, n_new = tracker.update(path)
+        except Exception as e:  # np. plik zapisywany w tej chwili od nowa - spróbujemy przy następnej zmianie
+            print(f"{os.path.basename(path)}: błąd odczytu: {e}", file=sys.stderr)
+            inc("errors", where="load")
+            tracker.forget(path)
+            return
+        if initial and not args.initial:
+            return  # stan początkowy - kolejne zmiany to już tylko dopisane wiersze
+        if n_new and not initial:
+            print(f"{os.path.basename(path)}: nowe wiersze: {n_new}", file=sys.stderr)
+        if n_new or initial:
+            if path in pending:
+                pending[path].cancel()  # prognoza dla starszych danych (jeśli jeszcze nie ruszyła)
+            pending[path] = background.submit(run, path, dates, values, tickers)
+
+    # prognozy liczą się w tle (wątek + pula procesów w coa.batch), a pętla dalej sprawdza katalog
+    with ThreadPoolExecutor(max_workers=1) as background:
+        for path in watcher.files():
+            ingest(path, initial=True)
+        try:
+            while True:
+                for path, future in list(pending.items()):
+                    if not future.done():
+                        continue
+                    del pending[path]
+                    try:
+                        frame = future.result()
+                    except Exception as e:
+                        print(f"{os.path.basename(path)}: błąd prognozy: {e}", file=sys.stderr)
+                        inc("errors", where="forecast")
+                        continue
+                    with span("export"):
+                        sys.stdout.write(frame.to_csv(sep=";", index=False, header=header))
+                        sys.stdout.flush()
+                    inc("exports", format="csv")
+                    header = False
+                if args.metrics_file:
+                    METRICS.write(args.metrics_file)
+                time.sleep(args.interval)
+                for path in watcher.poll():
+                    ingest(path)
+        except KeyboardInterrupt:
+            return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# -------------------
+# Widżety Tkinter używane przez MAIN.py
+# -------------------
+
+from tkinter import ttk
+
+
+class VirtualTable(ttk.Frame):
+    # Tabela "wirtualna": w Treeview istnieje tylko tyle wierszy, ile mieści się na ekranie.
+    # Dane nie są kopiowane do Tk - przy każdym przewinięciu pobieramy widoczny fragment z:
+    #   row_count()        -> liczba wszystkich wierszy
+    #   rows(start, stop)  -> lista krotek z wartościami kolumn dla wierszy [start, stop)
+    # Dzięki temu koszt po stronie GUI jest stały, niezależnie od długości historii.
+
+    def __init__(self, parent, columns, row_count, rows, widths=None):
+        super().__init__(parent)
+        self._row_count = row_count
+        self._rows = rows
+        self._top = 0        # indeks pierwszego widocznego wiersza
+        self._visible = 1    # ile wierszy mieści się w oknie (aktualizowane przy zmianie rozmiaru)
+
+        scroll_y = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        scroll_x = ttk.Scrollbar(self, orient="horizontal")
+
+        self.tree = ttk.Treeview(
+            self,
+            columns=columns,             # ID kolumn
+            show="headings",             # chowa kolumne #0
+            selectmode="none",           # wiersze Treeview są tylko "slotami" - zaznaczenie przesuwałoby się z przewijaniem
+            xscrollcommand=scroll_x.set)
+        for i, col in enumerate(columns):
+            self.tree.heading(col, text=col)
+            if widths:
+                self.tree.column(col, width=widths[i])
+
+        scroll_x.config(command=self.tree.xview)
+        self._scroll_y = scroll_y
+
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        scroll_y.grid(row=0, column=1, sticky="ns")
+        scroll_x.grid(row=1, column=0, sticky="ew")
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        # ---- zdarzenia: zmiana rozmiaru i kółko myszy (Windows/macOS + Linux) ----
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1, "units"))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1, "units"))
+
+    # ===============================
+    # Przewijanie
+    # ===============================
+    def yview(self, *args):
+        # obsługa poleceń scrollbara: ("moveto", ułamek) albo ("scroll", n, "units"/"pages")
+        if args[0] == "moveto":
+            self._set_top(round(float(args[1]) * self._row_count()))
+        elif args[0] == "scroll":
+            self.scroll(int(args[1]), args[2])
+
+    def scroll(self, n, what="units"):
+        step = self._visible if what == "pages" else 1
+        self._set_top(self._top + n * step)
+
+    def _set_top(self, top):
+        self._top = max(0, min(top, self._row_count() - self._visible))
+        self.refresh()
+
+    def _on_resize(self, event):
+        style = ttk.Style(self)
+        row_height = int(style.lookup("Treeview", "rowheight") or 20)
+        self._visible = max(1, event.height // row_height - 1)  # -1 na wiersz nagłówka
+        self._set_top(self._top)
+
+    # ===============================
+    # Odświeżenie widocznych wierszy
+    # ===============================
+    def refresh(self, top=None):
+        if top is not None:
+            self._top = top
+        total = self._row_count()
+        self._top = max(0, min(self._top, total - self._visible))
+        rows = self._rows(self._top, min(self._top + self._visible, total)) if total else []
+
+        # dopasowujemy liczbę elementów Treeview do liczby widocznych wierszy i podmieniamy im wartości
+        items = self.tree.get_children()
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+        for i, values in enumerate(rows):
+            if i < len(items):
+                self.tree.item(items[i], values=values)
+            else:
+                self.tree.insert("", "end", values=values)
+
+        # ---- położenie suwaka (ułamki całej długości danych) ----
+        if total:
+            self._scroll_y.set(self._top / total, min(self._top + self._visible, total) / total)
+        else:
+            self._scroll_y.set(0.0, 1.0)
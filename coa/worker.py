@@ -0,0 +1,125 @@
+# -------------------
+# Proces roboczy do dopasowywania modeli poza wątkiem GUI
+# -------------------
+
+import importlib
+import itertools
+import multiprocessing as mp
+import queue
+import time
+
+from coa.timing import TIMINGS
+
+
+def _worker_main(tasks, results, warmup=()):
+    # Import ciężkich modułów od razu po starcie procesu, zanim przyjdzie pierwsze zadanie
+    for name in warmup:
+        importlib.import_module(name)
+
+    # Pętla procesu roboczego: bierze zadania z kolejki i odsyła zdarzenia:
+    #   ("started", id, czas_w_kolejce)  ("progress", id, iteracja)
+    #   ("done", id, wynik, czas_dopasowania, czasy_etapów)  ("error", id, opis_błędu, czas_dopasowania)
+    # czasy_etapów - odcinki coa.timing zmierzone w trakcie zadania (etap -> s)
+    while True:
+        task = tasks.get()
+        if task is None:
+            break  # sygnał zakończenia
+        job_id, submitted_at, func, args, kwargs = task
+        results.put(("started", job_id, time.time() - submitted_at))
+
+        def progress(n, job_id=job_id):
+            results.put(("progress", job_id, n))
+
+        TIMINGS.begin()
+        start = time.perf_counter()
+        try:
+            value = func(*args, progress=progress, **kwargs)
+            results.put(("done", job_id, value, time.perf_counter() - start, TIMINGS.take()))
+        except Exception as e:
+            results.put(("error", job_id, repr(e), time.perf_counter() - start))
+
+
+class FitWorker:
+    # Osobny proces (nie wątek), bo dopasowanie ARIMA trzyma GIL, a proces da się przerwać (anulowanie).
+    # Proces startuje przy pierwszym zadaniu i działa dalej, więc statsmodels importuje się tylko raz.
+    # GUI odbiera zdarzenia przez poll() wywoływane cyklicznie z root.after.
+    # func musi być funkcją modułu (pickle) i przyjmować argument progress.
+
+    def __init__(self, warmup=()):
+        self._warmup = tuple(warmup)         # moduły importowane przy starcie procesu
+        self._ctx = mp.get_context("spawn")  # to samo zachowanie na Windows/Linux/macOS; fork z działającym Tk jest ryzykowny
+        self._process = None
+        self._tasks = None
+        self._results = None
+        self._ids = itertools.count(1)
+        self.pending = set()  # id zadań wysłanych, ale jeszcze nie zakończonych
+
+    def start(self):
+        if self._process is not None and self._process.is_alive():
+            return
+        self._tasks = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        self._process = self._ctx.Process(target=_worker_main, args=(self._tasks, self._results, self._warmup),
+                                         daemon=True)
+        self._process.start()
+
+    def submit(self, func, *args, **kwargs):
+        self.start()
+        job_id = next(self._ids)
+        self.pending.add(job_id)
+        self._tasks.put((job_id, time.time(), func, args, kwargs))
+        return job_id
+
+    @property
+    def busy(self):
+        return bool(self.pending)
+
+    # ===============================
+    # Odbiór zdarzeń (bez blokowania)
+    # ===============================
+    def poll(self):
+        events = []
+        if self._results is None:
+            return events
+        while True:
+            try:
+                event = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if event[1] not in self.pending:
+                continue  # zdarzenie anulowanego zadania
+            if event[0] in ("done", "error"):
+                self.pending.discard(event[1])
+            events.append(event)
+
+        # proces zakończył się poza cancel() (błąd, zabity przy braku pamięci) - jego zadania nigdy się nie skończą
+        if self.pending and (self._process is None or not self._process.is_alive()):
+            events.extend(("error", job_id, "proces roboczy zakończył się", 0) for job_id in sorted(self.pending))
+            self.pending.clear()
+            self._terminate()  # następny submit() uruchomi nowy proces
+        return events
+
+    # ===============================
+    # Anulowanie / zamknięcie
+    # ===============================
+    def cancel(self):
+        # Przerywa zadania w toku - proces jest zabijany i uruchomi się ponownie przy następnym submit()
+        cancelled = sorted(self.pending)
+        if cancelled:
+            self._terminate()
+        self.pending.clear()
+        return cancelled
+
+    def close(self):
+        if self._process is not None and self._process.is_alive():
+            self._tasks.put(None)
+            self._process.join(timeout=1)
+        self._terminate()
+
+    def _terminate(self):
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process.join(timeout=1)
+        self._process = None
+        self._results = None
@@ -0,0 +1,30 @@
+# -------------------
+# coa.backtest.state_forecasts - te same prognozy co statsmodels get_forecast z każdego punktu startowego
+# -------------------
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from coa.backtest import state_forecasts
+
+
+@pytest.mark.parametrize("order", [(2, 1, 1), (1, 0, 1)])  # d = 0: stała w modelu (state/obs intercept)
+def test_state_forecasts_match_get_forecast(order):
+    from statsmodels.tsa.arima.model import ARIMA
+
+    rng = np.random.default_rng(0)
+    values = 100 + np.cumsum(rng.normal(size=300)) if order[1] else 5 + rng.normal(size=300)
+    origins = np.array([150, 151, 220, 289])
+    steps = 5
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        params = ARIMA(pd.Series(values[:150]), order=order).fit().params
+        mean, se = state_forecasts(ARIMA(pd.Series(values[:origins[-1] + 1]), order=order).filter(params),
+                                   origins, steps)
+        for i, origin in enumerate(origins):
+            expected = ARIMA(pd.Series(values[:origin + 1]), order=order).filter(params).get_forecast(steps)
+            assert np.allclose(mean[i], expected.predicted_mean, rtol=1e-9, atol=1e-9)
+            assert np.allclose(se[i], expected.se_mean, rtol=1e-9, atol=1e-9)
@@ -0,0 +1,53 @@
+# -------------------
+# coa.cache - klucze prognoz, LRU w pamięci, zapis i odczyt z dysku
+# -------------------
+
+import os
+
+import numpy as np
+
+from coa.cache import ForecastCache, forecast_key
+
+
+def _result(x):
+    return np.array([x, x + 1.0]), np.array([0.5, 0.7])
+
+
+def test_key_depends_on_values_and_parameters():
+    values = np.arange(10, dtype=np.float64)
+    key = forecast_key(values, (5, 1, 0), 1)
+    assert key == forecast_key(values.tolist(), (5, 1, 0), 1)  # ten sam szereg niezależnie od źródła
+    assert key != forecast_key(values + 1, (5, 1, 0), 1)
+    assert key != forecast_key(values, (2, 1, 2), 1)
+    assert key != forecast_key(values, (5, 1, 0), 2)
+    assert key != forecast_key(values, (5, 1, 0), 1, method="ols")
+    assert key != forecast_key(values, (5, 1, 0), 1, window=(0, 5))
+
+
+def test_lru_eviction():
+    cache = ForecastCache(max_items=2)
+    cache.put("a", _result(1))
+    cache.put("b", _result(2))
+    assert cache.get("a") is not None  # "a" ostatnio używany - usunięty zostanie "b"
+    cache.put("c", _result(3))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_disk_round_trip(tmp_path):
+    ForecastCache(directory=str(tmp_path)).put("k", _result(1))
+    cache = ForecastCache(directory=str(tmp_path))  # nowy obiekt - jak po ponownym uruchomieniu programu
+    mean, se = cache.get("k")
+    assert mean.tolist() == [1.0, 2.0] and se.tolist() == [0.5, 0.7]
+    assert cache.get("brak") is None
+
+
+def test_disk_limit_removes_least_recently_used(tmp_path):
+    cache = ForecastCache(max_items=1, directory=str(tmp_path), max_files=2)
+    for i, key in enumerate(("a", "b"), 1):
+        cache.put(key, _result(1))
+        os.utime(tmp_path / f"forecast_{key}.npz", (i, i))  # stare pliki: "a" starszy od "b"
+    ForecastCache(directory=str(tmp_path)).get("a")  # odczyt z dysku odświeża "a"
+    cache.put("c", _result(1))
+    assert sorted(os.listdir(tmp_path)) == ["forecast_a.npz", "forecast_c.npz"]
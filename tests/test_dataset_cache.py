@@ -0,0 +1,58 @@
+# -------------------
+# coa.dataset_cache.DatasetCache - kopia ważna tylko dla niezmienionego pliku (rozmiar, mtime, skrót)
+# -------------------
+
+import os
+
+import numpy as np
+
+from coa.dataset_cache import DatasetCache
+
+HEADER = "Ticker;BTC-USD\n"
+
+
+def _write(path, text, mtime_ns):
+    path.write_text(HEADER + text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_hit_after_first_read(tmp_path):
+    path = tmp_path / "prices.csv"
+    _write(path, "01.01.2024;100\n02.01.2024;101\n", 10**18)
+    cache = DatasetCache(str(tmp_path / "cache"))
+    dates, values, tickers = cache.read_prices(str(path))
+    again = cache.read_prices(str(path))
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert np.array_equal(again[0], dates) and np.array_equal(again[1], values) and again[2] == tickers == ["BTC-USD"]
+
+
+def test_size_change_invalidates(tmp_path):
+    path = tmp_path / "prices.csv"
+    _write(path, "01.01.2024;100\n", 10**18)
+    cache = DatasetCache(str(tmp_path / "cache"))
+    cache.read_prices(str(path))
+    _write(path, "01.01.2024;100\n02.01.2024;101\n", 10**18)  # ten sam mtime, inny rozmiar
+    assert cache.get(str(path)) is None
+    assert cache.read_prices(str(path))[1][:, 0].tolist() == [100.0, 101.0]
+
+
+def test_mtime_change_same_content_is_hit(tmp_path):
+    # plik "dotknięty" albo skopiowany: decyduje skrót zawartości, nowy mtime jest zapamiętywany
+    path = tmp_path / "prices.csv"
+    _write(path, "01.01.2024;100\n", 10**18)
+    cache = DatasetCache(str(tmp_path / "cache"))
+    cache.read_prices(str(path))
+    os.utime(path, ns=(2 * 10**18, 2 * 10**18))
+    assert cache.get(str(path)) is not None
+    with open(os.path.join(cache._entry(str(path)), "meta.json"), encoding="utf-8") as f:
+        assert '"mtime_ns": 2000000000000000000' in f.read()
+
+
+def test_mtime_change_different_content_invalidates(tmp_path):
+    path = tmp_path / "prices.csv"
+    _write(path, "01.01.2024;100\n", 10**18)
+    cache = DatasetCache(str(tmp_path / "cache"))
+    cache.read_prices(str(path))
+    _write(path, "01.01.2024;200\n", 2 * 10**18)  # ten sam rozmiar, inna zawartość
+    assert cache.get(str(path)) is None
+    assert cache.read_prices(str(path))[1][:, 0].tolist() == [200.0]
@@ -0,0 +1,29 @@
+# -------------------
+# coa.downsample.lttb
+# -------------------
+
+import numpy as np
+
+from coa.downsample import lttb
+
+
+def test_keeps_endpoints_and_count():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.sin(x / 50)
+    idx = lttb(x, y, 100)
+    assert len(idx) == 100
+    assert idx[0] == 0 and idx[-1] == 999
+    assert np.all(np.diff(idx) > 0)  # rosnące, bez powtórzeń
+
+
+def test_keeps_spike():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.zeros(1000)
+    y[537] = 10.0
+    assert 537 in lttb(x, y, 50)
+
+
+def test_small_input_unchanged():
+    x = np.arange(10, dtype=np.float64)
+    assert lttb(x, x, 10).tolist() == list(range(10))
+    assert lttb(x, x, 2).tolist() == list(range(10))
@@ -0,0 +1,13 @@
+# -------------------
+# coa.fast_ar.psi_weights
+# -------------------
+
+import numpy as np
+
+from coa.fast_ar import psi_weights
+
+
+def test_psi_weights():
+    assert np.allclose(psi_weights([0.5], 0, 5), 0.5 ** np.arange(5))  # AR(1): psi_j = phi^j
+    assert np.allclose(psi_weights([], 1, 5), np.ones(5))             # błądzenie losowe
+    assert np.allclose(psi_weights([0.5], 1, 4), [1, 1.5, 1.75, 1.875])  # sumy wag AR(1)
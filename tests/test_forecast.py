@@ -0,0 +1,29 @@
+# -------------------
+# coa.forecast.fit_window
+# -------------------
+
+import numpy as np
+import pytest
+
+from coa.forecast import fit_window
+
+DATES = np.datetime64("2024-01-01", "s") + np.arange(10) * np.timedelta64(1, "D")  # 01.01 - 10.01.2024
+
+
+def test_fit_window_observations():
+    assert fit_window("", DATES) is None
+    assert fit_window(None, DATES) is None
+    assert fit_window("3", DATES) == (7, 10)
+    assert fit_window("100", DATES) == (0, 10)
+
+
+def test_fit_window_dates():
+    assert fit_window("03.01.2024", DATES) == (2, 10)
+    assert fit_window("03.01.2024-05.01.2024", DATES) == (2, 5)  # oba końce włącznie
+    assert fit_window(" 03.01.2024 - 05.01.2024 ", DATES) == (2, 5)
+
+
+def test_fit_window_invalid():
+    with pytest.raises(ValueError):
+        fit_window("ostatni rok", DATES)
+
@@ -0,0 +1,85 @@
+# -------------------
+# coa.ingest: liczby z przecinkiem dziesiętnym, FileTail (odczyt tylko dopisanych wierszy)
+# -------------------
+
+import numpy as np
+import pandas as pd
+
+from coa.ingest import FileTail, read_prices, to_float
+
+HEADER = "Ticker;BTC-USD\n"
+
+
+def _tail(path, text):
+    path.write_text(HEADER + text, encoding="utf-8")
+    dates, _, _ = read_prices(str(path))
+    return FileTail(str(path), dates)
+
+
+def _append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_to_float_mixed_decimal_separators():
+    # pojedyncze wiersze "66191,00" w pliku z kropkami (BTC_prices.csv) nie mogą zamienić się w NaN
+    assert to_float(pd.Series(["18364.12109", "66191,00", "1,5"])).tolist() == [18364.12109, 66191.0, 1.5]
+    assert to_float(pd.Series([1.5, 2.0])).tolist() == [1.5, 2.0]
+    assert np.isnan(to_float(pd.Series(["abc", "2"]))[0])
+
+
+def test_read_prices_mixed_decimal_separators(tmp_path):
+    path = tmp_path / "prices.csv"
+    path.write_text(HEADER + "01.01.2024;100.5\n02.01.2024;101,25\n03.01.2024;102\n", encoding="utf-8")
+    _, values, tickers = read_prices(str(path))
+    assert tickers == ["BTC-USD"]
+    assert values[:, 0].tolist() == [100.5, 101.25, 102.0]
+
+
+def test_appended_rows(tmp_path):
+    path = tmp_path / "prices.csv"
+    tail = _tail(path, "01.01.2024;100\n02.01.2024;101\n")
+    _append(path, "03.01.2024;102\n04.01.2024;103\n")
+
+    dates, values = tail.read_new()
+    assert dates.tolist() == [np.datetime64("2024-01-03", "s"), np.datetime64("2024-01-04", "s")]
+    assert values[:, 0].tolist() == [102.0, 103.0]
+    assert len(tail.read_new()[0]) == 0  # drugi odczyt - nic nowego
+
+
+def test_partial_line_waits_for_newline(tmp_path):
+    path = tmp_path / "prices.csv"
+    tail = _tail(path, "01.01.2024;100\n")
+    _append(path, "02.01.2024;10")  # zapis w toku
+
+    assert len(tail.read_new()[0]) == 0
+    _append(path, "1\n")
+    dates, values = tail.read_new()
+    assert dates.tolist() == [np.datetime64("2024-01-02", "s")]
+    assert values[:, 0].tolist() == [101.0]
+
+
+def test_file_without_trailing_newline(tmp_path):
+    # ostatni wiersz bez "\n" wczytał już pełny odczyt - po dopisaniu nie może pojawić się drugi raz
+    path = tmp_path / "prices.csv"
+    tail = _tail(path, "01.01.2024;100\n02.01.2024;101")
+    assert len(tail.read_new()[0]) == 0
+
+    _append(path, "\n03.01.2024;102\n")
+    dates, values = tail.read_new()
+    assert dates.tolist() == [np.datetime64("2024-01-03", "s")]
+    assert values[:, 0].tolist() == [102.0]
+
+
+def test_rewritten_file(tmp_path):
+    path = tmp_path / "prices.csv"
+    tail = _tail(path, "01.01.2024;100\n02.01.2024;101\n")
+    path.write_text(HEADER + "01.01.2024;200\n02.01.2024;201\n03.01.2024;202\n", encoding="utf-8")
+    assert tail.read_new() is None  # trzeba wczytać całość
+
+
+def test_truncated_file(tmp_path):
+    path = tmp_path / "prices.csv"
+    tail = _tail(path, "01.01.2024;100\n02.01.2024;101\n")
+    path.write_text(HEADER + "01.01.2024;100\n", encoding="utf-8")
+    assert tail.read_new() is None
@@ -0,0 +1,98 @@
+# -------------------
+# coa.service - sprawdzanie żądań, łączenie identycznych żądań, obsługa HTTP
+# -------------------
+
+import http.client
+import json
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+from coa.cache import forecast_key
+from coa.service import ForecastService, RequestError, make_server
+
+VALUES = [100 + (i % 7) + i * 0.1 for i in range(60)]
+
+
+@pytest.fixture
+def service(tmp_path):
+    (tmp_path / "BTC_prices.csv").write_text(
+        "Ticker;BTC-USD\n" + "".join(f"{d:02d}.01.2024;{v}\n" for d, v in zip(range(1, 32), VALUES)),
+        encoding="utf-8")
+    service = ForecastService(data_dir=str(tmp_path), workers=1)
+    yield service
+    service.close()
+
+
+@pytest.mark.parametrize("request_, message", [
+    ([], "obiekt JSON"),
+    ({}, "dataset albo values"),
+    ({"values": VALUES, "horizon": 0}, "horizon"),
+    ({"values": VALUES, "horizon": float("inf")}, "horizon"),    # Infinity z json.loads
+    ({"values": VALUES, "horizon": float("nan")}, "horizon"),
+    ({"values": VALUES, "horizon": True}, "horizon"),
+    ({"values": VALUES, "order": [5, 1]}, "order"),
+    ({"values": VALUES, "alpha": 1.5}, "alpha"),
+    ({"values": VALUES, "fast": "ols", "order": [2, 1, 1]}, "fast"),
+    ({"values": ["1.5", "2"]}, "values"),
+    ({"values": [1.0, float("inf")]}, "values"),
+    ({"values": []}, "values"),
+    ({"dataset": "BTC_prices", "column": True}, "column"),
+    ({"dataset": "BTC_prices", "column": 1}, "column"),
+])
+def test_invalid_requests(service, request_, message):
+    with pytest.raises(RequestError, match=message) as error:
+        service.forecast(request_)
+    assert error.value.status == 400
+
+
+def test_unknown_dataset(service):
+    with pytest.raises(RequestError) as error:
+        service.forecast({"dataset": "../BTC_prices"})
+    assert error.value.status == 404
+
+
+def test_dataset_forecast_and_cache(service):
+    request = {"dataset": "BTC_prices", "column": "BTC-USD", "horizon": 2, "fast": "ols"}
+    first = service.forecast(request)
+    assert first["source"] == "computed" and first["ticker"] == "BTC-USD" and first["nobs"] == 31
+    assert first["dates"] == ["01.02.2024", "02.02.2024"] and len(first["lower"]) == 2
+    second = service.forecast(request)
+    assert second["source"] == "cache" and second["forecast"] == first["forecast"]
+
+
+def test_identical_request_waits_for_result_in_progress(service):
+    # dopasowanie w toku dla tego samego klucza - drugie żądanie czeka na jego wynik zamiast liczyć od nowa
+    key = forecast_key(np.asarray(VALUES), (5, 1, 0), 1, "ols")
+    pending = service._inflight[key] = Future()
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(service.forecast({"values": VALUES, "fast": "ols"})))
+    thread.start()
+    pending.set_result((np.array([123.0]), np.array([1.0])))
+    thread.join(timeout=10)
+    assert result["source"] == "coalesced" and result["forecast"] == [123.0]
+
+
+def test_http(service):
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        def post(body, length=None):
+            connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+            connection.putrequest("POST", "/forecast")
+            connection.putheader("Content-Length", str(len(body)) if length is None else length)
+            connection.endheaders(body)
+            response = connection.getresponse()
+            return response.status, json.loads(response.read())
+
+        status, payload = post(json.dumps({"values": VALUES, "fast": "ols"}).encode())
+        assert status == 200 and payload["method"] == "ols"
+        assert post(b'{"values": [1, 2], "horizon": Infinity}')[0] == 400
+        assert post(b"{")[0] == 400
+        assert post(b"", "abc")[0] == 400
+        assert post(b"", "-1")[0] == 400
+    finally:
+        server.shutdown()
+        server.server_close()